@@ -1,9 +1,52 @@
+import time
+
 import streamlit as st
 import numpy as np
 import pandas as pd
 
 st.set_page_config(page_title="House Price Prediction API", layout="wide")
 
+# Parameters the what-if sweep can vary: label -> (argument, low, high)
+SWEEP_PARAMS = {
+    "Square Feet": ("square_feet", 500, 5000),
+    "House Age (years)": ("age", 0, 100),
+    "Bathrooms": ("bathrooms", 1.0, 5.0),
+    "Bedrooms": ("bedrooms", 1, 10),
+}
+
+
+def estimate_price(square_feet, bedrooms, bathrooms, age, pool):
+    """Mock prediction (replace with your actual model).
+
+    Plain arithmetic, so it takes scalars or NumPy arrays that broadcast
+    together and scores a whole grid in one call.
+    """
+    price = square_feet * 150 + bedrooms * 50000 + bathrooms * 30000
+    return price - age * 500 + pool * 50000
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def sweep_prices(base, x_label, x_range, points, curve_label, curve_values):
+    """Price curves over x_label, one per value of curve_label.
+
+    The grid is built as (curves, points) arrays and scored at once; the
+    result is cached by its inputs, so reruns with the same settings are free.
+    """
+    x_name = SWEEP_PARAMS[x_label][0]
+    x = np.linspace(x_range[0], x_range[1], points)
+    columns = dict(base)
+    if curve_label is None:
+        columns[x_name] = x[np.newaxis, :]
+        names = ["Price"]
+    else:
+        grid_x, grid_curve = np.meshgrid(x, np.asarray(curve_values, dtype=np.float64))
+        columns[x_name] = grid_x
+        columns[SWEEP_PARAMS[curve_label][0]] = grid_curve
+        names = [f"{curve_label} = {value:g}" for value in curve_values]
+    prices = np.broadcast_to(estimate_price(**columns), (len(names), points))
+    return pd.DataFrame(prices.T, index=pd.Index(x, name=x_label), columns=names)
+
+
 # Custom CSS
 st.markdown("""
     <style>
@@ -17,7 +60,7 @@ st.title("🏠 House Price Prediction API")
 st.markdown("**Predict house prices using machine learning regression**")
 
 # Create tabs
-tab1, tab2, tab3 = st.tabs(["Predict", "About", "Model Info"])
+tab1, tab_sweep, tab2, tab3 = st.tabs(["Predict", "What-if", "About", "Model Info"])
 
 with tab1:
     st.header("Enter Property Details")
@@ -39,10 +82,7 @@ with tab1:
         neighborhood = st.selectbox("Neighborhood", ["Downtown", "Suburban", "Rural"])
     
     if st.button("💰 Predict Price", use_container_width=True):
-        # Mock prediction (replace with your actual model)
-        base_price = square_feet * 150
-        price = base_price + (bedrooms * 50000) + (bathrooms * 30000)
-        price = price - (age * 500) + (50000 if pool else 0)
+        price = estimate_price(square_feet, bedrooms, bathrooms, age, pool)
         
         st.success(f"**Predicted Price: ${price:,.0f}**")
         
@@ -71,6 +111,40 @@ with tab1:
         })
         st.table(breakdown)
 
+with tab_sweep:
+    st.header("Sensitivity Analysis")
+    st.caption("Price curves around the property entered on the Predict tab.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        x_label = st.selectbox("Vary", list(SWEEP_PARAMS))
+        _, low, high = SWEEP_PARAMS[x_label]
+        x_range = st.slider(f"{x_label} range", low, high, (low, high))
+        points = st.select_slider("Points per curve", [100, 500, 1000, 2500, 5000, 10000], value=1000)
+    with col2:
+        curve_options = ["None"] + [label for label in SWEEP_PARAMS if label != x_label]
+        curve_label = st.selectbox("One curve per", curve_options)
+        curve_label = None if curve_label == "None" else curve_label
+        curve_values = ()
+        if curve_label is not None:
+            _, low, high = SWEEP_PARAMS[curve_label]
+            curves = st.slider("Curves", 2, 10, 5)
+            values = np.linspace(low, high, curves)
+            if isinstance(low, int):
+                values = np.unique(np.round(values))
+            curve_values = tuple(float(value) for value in values)
+
+    base = {
+        "square_feet": square_feet, "bedrooms": bedrooms, "bathrooms": bathrooms,
+        "age": age, "pool": pool,
+    }
+    started = time.perf_counter()
+    curves_df = sweep_prices(base, x_label, x_range, points, curve_label, curve_values)
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+    st.line_chart(curves_df)
+    st.caption(f"{curves_df.size:,} points in {elapsed_ms:.1f} ms")
+
 with tab2:
     st.header("About This Project")
     st.markdown("""
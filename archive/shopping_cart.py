@@ -7,13 +7,15 @@ Provides a minimal ShoppingCart class with add/remove/total and a small demo whe
 from dataclasses import dataclass, field
 from typing import Dict
 
-@dataclass
+# slotted: no per-instance __dict__. Item stays mutable because the cart
+# updates qty in place.
+@dataclass(slots=True)
 class Item:
     name: str
     price: float
     qty: int = 1
 
-@dataclass
+@dataclass(slots=True)
 class ShoppingCart:
     items: Dict[str, Item] = field(default_factory=dict)
 
@@ -0,0 +1,93 @@
+import threading
+import time
+import queue
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Merges concurrent single-row predictions into one model call.
+
+    Callers submit one feature row and get a Future back. A worker thread
+    collects rows until either max_batch_size rows are waiting or the oldest
+    row has waited max_wait_ms, then stacks them and calls predict_fn once.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=2.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._rows = 0
+        self._max_batch_seen = 0
+        self._delay_total = 0.0
+        self._delay_max = 0.0
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, row):
+        future = Future()
+        self._queue.put((row, future, time.perf_counter()))
+        return future
+
+    def _collect(self):
+        # block for the first row, then fill the batch until the window closes
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # a caller that gave up (timeout, shutdown) has cancelled its
+            # future; drop it, and the rest can no longer be cancelled
+            batch = [entry for entry in self._collect() if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            started = time.perf_counter()
+            try:
+                features = np.array([row for row, _, _ in batch], dtype=float)
+                predictions = self.predict_fn(features)
+                results = [float(prediction) for prediction in predictions]
+                if len(results) != len(batch):
+                    raise ValueError(f"predict_fn returned {len(results)} predictions for {len(batch)} rows")
+            except Exception as exc:
+                for _, future, _ in batch:
+                    future.set_exception(exc)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            self._record(batch, started)
+
+    def _record(self, batch, started):
+        delays = [started - enqueued for _, _, enqueued in batch]
+        with self._lock:
+            self._batches += 1
+            self._rows += len(batch)
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            self._delay_total += sum(delays)
+            self._delay_max = max(self._delay_max, max(delays))
+
+    def stats(self):
+        with self._lock:
+            batches, rows = self._batches, self._rows
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": batches,
+                "rows": rows,
+                "mean_batch_size": rows / batches if batches else 0.0,
+                "max_batch_size_seen": self._max_batch_seen,
+                "mean_queue_delay_ms": self._delay_total / rows * 1000.0 if rows else 0.0,
+                "max_queue_delay_ms": self._delay_max * 1000.0,
+            }
@@ -0,0 +1,236 @@
+"""Benchmarks for the prediction service.
+
+Everything runs offline. Run from backend/:
+
+    python benchmark.py latency                      # in-process ASGI client
+    python benchmark.py latency --url http://127.0.0.1:8000
+    python benchmark.py predict                      # model.predict micro-benchmarks
+    python benchmark.py startup --workers 4
+    python benchmark.py all
+
+Results are written as JSON (--output) so runs can be compared between commits.
+"""
+
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+
+# shared benchmark helpers live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from benchmark_common import make_parser, percentiles, run  # noqa: E402
+
+# child process for the startup benchmark: load the model the way a uvicorn
+# worker does and report load time and memory from /proc
+WORKER_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from model_store import load_model
+imported = time.perf_counter()
+# keep a reference: memory is read below, after the load
+model = load_model(sys.argv[1])
+loaded = time.perf_counter()
+memory = {}
+for name in ("/proc/self/status", "/proc/self/smaps_rollup"):
+    try:
+        for line in open(name):
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile", "Pss"):
+                memory[key] = int(value.split()[0])
+    except OSError:
+        pass
+print(json.dumps({"import_s": imported - started, "load_s": loaded - imported, "memory_kb": memory}))
+"""
+
+
+def measure_workers(path, workers):
+    # start all workers together so they overlap like a uvicorn --workers N pool
+    procs = [
+        subprocess.Popen([sys.executable, "-c", WORKER_PROBE, path], stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    return [json.loads(proc.communicate()[0]) for proc in procs]
+
+
+def summarize(samples):
+    summary = {
+        "import_s": sum(s["import_s"] for s in samples) / len(samples),
+        "load_s": sum(s["load_s"] for s in samples) / len(samples),
+    }
+    for key in ("VmRSS", "RssAnon", "RssFile", "Pss"):
+        values = [s["memory_kb"][key] for s in samples if key in s["memory_kb"]]
+        if values:
+            summary[f"{key}_kb"] = sum(values) / len(values)
+    return summary
+
+
+def random_house(rng):
+    # random values so the prediction cache does not turn the run into a cache benchmark
+    return {"area": rng.uniform(300, 6000), "bedrooms": rng.randint(1, 7), "bathrooms": rng.randint(1, 5)}
+
+
+@asynccontextmanager
+async def make_client(url):
+    import httpx
+
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=30.0) as client:
+            yield client
+        return
+
+    from main import app
+
+    # ASGITransport does not run the startup phase, so drive it here and
+    # wait for warmup like a load balancer polling /health/ready would
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30.0) as client:
+            while (await client.get("/health/ready")).status_code != 200:
+                await asyncio.sleep(0.05)
+            yield client
+
+
+async def run_level(client, path, make_payload, concurrency, total):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            payload = make_payload()
+            started = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"requests": total, "errors": errors, "rps": total / elapsed, **percentiles(latencies)}
+
+
+async def run_latency(args):
+    rng = random.Random(args.seed)
+    scenarios = [("/predict", 1, lambda: random_house(rng))]
+    for size in args.batch_sizes:
+        scenarios.append(("/predict/batch", size, lambda size=size: [random_house(rng) for _ in range(size)]))
+
+    results = []
+    async with make_client(args.url) as client:
+        for path, rows, make_payload in scenarios:
+            # warm up connections and first-call code paths before measuring
+            await run_level(client, path, make_payload, 1, min(20, args.requests))
+            for concurrency in args.concurrency:
+                level = await run_level(client, path, make_payload, concurrency, args.requests)
+                level.update(path=path, rows_per_request=rows, concurrency=concurrency)
+                level["rows_per_second"] = level["rps"] * rows
+                print(f"{path:16} rows={rows:<6} c={concurrency:<4} "
+                      f"rps={level['rps']:9.1f} p50={level['p50_ms']:7.2f}ms "
+                      f"p95={level['p95_ms']:7.2f}ms p99={level['p99_ms']:7.2f}ms errors={level['errors']}")
+                results.append(level)
+    return results
+
+
+def bench_latency(args):
+    return asyncio.run(run_latency(args))
+
+
+def time_call(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_predict(args):
+    import numpy as np
+
+    from model_store import load_model
+
+    loaded = load_model(args.model)
+    rng = np.random.default_rng(args.seed)
+    results = []
+    for size in [1] + args.batch_sizes:
+        features = np.column_stack([
+            rng.uniform(300, 6000, size), rng.integers(1, 8, size), rng.integers(1, 6, size),
+        ]).astype(np.float64)
+        calls = {
+            "model.predict": lambda: loaded.model.predict(features),
+            f"{type(loaded.scorer).__name__}.predict": lambda: loaded.scorer.predict(features),
+        }
+        if size == 1:
+            calls[f"{type(loaded.scorer).__name__}.predict_row"] = lambda: loaded.scorer.predict_row(features[0])
+        for name, fn in calls.items():
+            samples = time_call(fn, args.repeat)
+            mean = sum(samples) / len(samples)
+            row = {"call": name, "rows": size, "mean_us": mean * 1e6, "us_per_row": mean * 1e6 / size,
+                   **percentiles(samples)}
+            print(f"{name:28} rows={size:<6} mean={row['mean_us']:10.1f}us per_row={row['us_per_row']:8.3f}us")
+            results.append(row)
+    return results
+
+
+def bench_all(args):
+    return {"predict": bench_predict(args), "latency": bench_latency(args), "startup": bench_startup(args)}
+
+
+def bench_startup(args):
+    results = {}
+    for path in args.models:
+        if not os.path.exists(path):
+            print(f"skipping {path}: not found (run trainmodel.py first)")
+            continue
+        results[path] = summarize(measure_workers(path, args.workers))
+        print(path, json.dumps(results[path], indent=2))
+    return {"workers": args.workers, "per_worker": results}
+
+
+def main():
+    parser, sub = make_parser(__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+
+    def latency_options(p):
+        p.add_argument("--url", default="", help="benchmark a running server instead of the in-process app")
+        p.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+        p.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+        p.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100, 1000])
+
+    def predict_options(p):
+        p.add_argument("--model", default="model.joblib" if os.path.exists("model.joblib") else "model.pkl")
+        p.add_argument("--repeat", type=int, default=2000)
+
+    def startup_options(p):
+        p.add_argument("--workers", type=int, default=4)
+        p.add_argument("--models", nargs="+", default=["model.pkl", "model.joblib"])
+
+    latency = sub.add_parser("latency", help="p50/p95/p99 latency and throughput at several concurrency levels")
+    latency_options(latency)
+    latency.set_defaults(run=bench_latency)
+
+    predict = sub.add_parser("predict", help="model.predict and scorer on a single row versus batches")
+    predict.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    predict_options(predict)
+    predict.set_defaults(run=bench_predict)
+
+    startup = sub.add_parser("startup", help="per-worker load time and memory, pickle vs memory-mapped joblib")
+    startup_options(startup)
+    startup.set_defaults(run=bench_startup)
+
+    everything = sub.add_parser("all", help="run every benchmark")
+    latency_options(everything)
+    predict_options(everything)
+    startup_options(everything)
+    everything.set_defaults(run=bench_all)
+
+    run(parser)
+
+
+if __name__ == "__main__":
+    main()
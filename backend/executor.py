@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFull(Exception):
+    """Raised when a lane has no free worker and its queue is full."""
+
+    def __init__(self, lane, retry_after):
+        super().__init__(f"{lane} inference queue is full")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class InferenceLane:
+    """A thread pool with a bounded number of running plus queued jobs."""
+
+    def __init__(self, name, workers, queue_size):
+        self.name = name
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"inference-{name}")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args):
+        return self.start(self._pool.submit, fn, *args)
+
+    def start(self, submit, *args):
+        """Take a slot and call submit(*args), which returns a Future.
+
+        The slot is held until that future is done. Returns None when the
+        lane is full.
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self.pending += 1
+        try:
+            future = submit(*args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def _release(self, _):
+        with self._lock:
+            self.pending -= 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {"workers": self.workers, "capacity": self.capacity, "pending": self.pending, "rejected": self.rejected}
+
+
+class InferenceExecutor:
+    """Runs CPU-bound scoring off the event loop in separate lanes.
+
+    Single-row requests and batch requests get their own pools, so a burst of
+    large batches cannot take the workers that cheap requests need. When a
+    lane is full, run() raises QueueFull instead of queueing without bound.
+    """
+
+    def __init__(self, single_workers=4, single_queue=256, batch_workers=2, batch_queue=16, retry_after=1):
+        self.retry_after = retry_after
+        self.lanes = {
+            "single": InferenceLane("single", single_workers, single_queue),
+            "batch": InferenceLane("batch", batch_workers, batch_queue),
+        }
+
+    async def run(self, lane, fn, *args, wait=False):
+        return await self.track(lane, self.lanes[lane].submit, fn, *args, wait=wait)
+
+    async def track(self, lane, submit, *args, wait=False):
+        """Count a job that submit(*args) schedules elsewhere against a lane.
+
+        For work queued on another worker, such as the micro-batcher, so
+        the lane's limit and 503 answer hold for it too.
+        """
+        # wait=True is for callers that cannot answer 503 any more, such as a
+        # response that is already streaming: they poll for a free slot instead
+        while True:
+            future = self.lanes[lane].start(submit, *args)
+            if future is not None:
+                return await asyncio.wrap_future(future)
+            if not wait:
+                self.lanes[lane].reject()
+                raise QueueFull(lane, self.retry_after)
+            await asyncio.sleep(0.005)
+
+    def stats(self):
+        return {name: lane.stats() for name, lane in self.lanes.items()}
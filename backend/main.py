@@ -1,40 +1,172 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-import pickle
+import time
+
+# import time is part of the cold-start cost reported by /health/ready
+IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import hmac
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Union
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+import numpy as np
 from fastapi.middleware.cors import CORSMiddleware
+from batching import MicroBatcher
+from cache import PredictionCache
+from executor import InferenceExecutor, QueueFull
+from metrics import MetricsMiddleware, StageTimer, registry as metrics_registry
+from model_store import ModelWatcher, load_model
+from registry import ModelNotFound, ModelRegistry
+from streaming import CsvRows, iter_lines, parse_ndjson, score_stream
 
+# model.joblib (written by trainmodel.py) is memory-mapped so uvicorn workers
+# share its arrays; model.pkl is the fallback for older artifacts
+MODEL_PATH = os.environ.get("MODEL_PATH", "model.joblib" if os.path.exists("model.joblib") else "model.pkl")
+# seconds between checks of MODEL_PATH for a new model, 0 disables the watcher
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", "0"))
+# POST /admin/reload is disabled unless this is set, and then requires a
+# matching X-Admin-Token header
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
 
-# Example training data
-data = {
-    "area": [1000, 1500, 1200, 1800, 2000],
-    "bedrooms": [2, 3, 2, 4, 4],
-    "bathrooms": [1, 2, 2, 3, 3],
-    "price": [120000, 180000, 150000, 240000, 270000]
-}
+# directory of named, versioned artifacts served under /models/{name}
+MODEL_REGISTRY_DIR = os.environ.get("MODEL_REGISTRY_DIR", "models")
+# how many registry models stay loaded before the least recently used is evicted
+MODEL_REGISTRY_MAX_LOADED = int(os.environ.get("MODEL_REGISTRY_MAX_LOADED", "4"))
+# seconds a model's version list is reused before its directory is checked again
+MODEL_REGISTRY_REFRESH_S = float(os.environ.get("MODEL_REGISTRY_REFRESH_S", "1"))
 
-df = pd.DataFrame(data)
+# synthetic predictions run at startup before /health/ready reports ready
+WARMUP_ROUNDS = int(os.environ.get("WARMUP_ROUNDS", "20"))
+WARMUP_BATCH_SIZES = [int(n) for n in os.environ.get("WARMUP_BATCH_SIZES", "16,256,4096").split(",") if n]
 
-X = df[["area", "bedrooms", "bathrooms"]]
-y = df["price"]
+# largest number of rows accepted by /predict/batch
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "10000"))
+# rows scored per vectorized call by /predict/stream
+STREAM_CHUNK_ROWS = int(os.environ.get("STREAM_CHUNK_ROWS", "5000"))
 
-model = LinearRegression()
-model.fit(X, y)
+# opt-in micro-batching of concurrent /predict calls
+MICROBATCH_ENABLED = os.environ.get("MICROBATCH_ENABLED", "0") == "1"
+MICROBATCH_MAX_ROWS = int(os.environ.get("MICROBATCH_MAX_ROWS", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get("MICROBATCH_MAX_WAIT_MS", "2"))
 
-# Save model
-pickle.dump(model, open("model.pkl", "wb"))
+# inference runs in two bounded thread pools so heavy batches cannot starve
+# single-row requests; a full lane answers 503 with Retry-After
+INFERENCE_SINGLE_WORKERS = int(os.environ.get("INFERENCE_SINGLE_WORKERS", "4"))
+INFERENCE_SINGLE_QUEUE = int(os.environ.get("INFERENCE_SINGLE_QUEUE", "256"))
+INFERENCE_BATCH_WORKERS = int(os.environ.get("INFERENCE_BATCH_WORKERS", "2"))
+INFERENCE_BATCH_QUEUE = int(os.environ.get("INFERENCE_BATCH_QUEUE", "16"))
+INFERENCE_RETRY_AFTER = int(os.environ.get("INFERENCE_RETRY_AFTER", "1"))
 
-print("Model trained and saved as model.pkl")
-from fastapi import FastAPI
-from pydantic import BaseModel
-import pickle
-import numpy as np
-from fastapi.middleware.cors import CORSMiddleware
+inference = InferenceExecutor(
+    INFERENCE_SINGLE_WORKERS, INFERENCE_SINGLE_QUEUE,
+    INFERENCE_BATCH_WORKERS, INFERENCE_BATCH_QUEUE,
+    INFERENCE_RETRY_AFTER,
+)
+
+# clients may reuse /model/coefficients for this long before revalidating;
+# the default 0 makes them check the ETag on every use
+COEFFICIENTS_MAX_AGE = int(os.environ.get("COEFFICIENTS_MAX_AGE", "0"))
+COEFFICIENTS_CACHE_CONTROL = (
+    f"public, max-age={COEFFICIENTS_MAX_AGE}, must-revalidate" if COEFFICIENTS_MAX_AGE > 0 else "no-cache"
+)
+# how long clients may remember that the model is not linear; a stale answer
+# only delays local scoring, /predict always uses the current model
+COEFFICIENTS_NOT_LINEAR_MAX_AGE = int(os.environ.get("COEFFICIENTS_NOT_LINEAR_MAX_AGE", "60"))
+
+# in-process cache of single-row predictions, 0 entries disables it
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.environ.get("PREDICTION_CACHE_TTL", "0"))
+
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+
+def set_model(loaded):
+    # a single reference swap: requests that already picked up the old
+    # model finish on it, new requests see the new one
+    global current
+    current = loaded
+    # cached predictions belong to the previous model
+    prediction_cache.clear()
+
+reload_lock = threading.Lock()
+reload_status = {"state": "idle", "error": None}
+
+def reload_model(path=MODEL_PATH):
+    # load and warm outside the request path, then swap; False when another
+    # reload was already running, so the caller can try again later
+    if not reload_lock.acquire(blocking=False):
+        return False
+    try:
+        reload_status.update(state="loading", error=None)
+        set_model(load_model(path))
+        reload_status.update(state="idle")
+    except Exception as exc:
+        reload_status.update(state="failed", error=repr(exc))
+    finally:
+        reload_lock.release()
+    return True
 
-# load ML model
-model = pickle.load(open("model.pkl", "rb"))
+# the ML model is loaded by the startup phase in lifespan()
+current = None
 
-app = FastAPI()
+model_registry = ModelRegistry(MODEL_REGISTRY_DIR, MODEL_REGISTRY_MAX_LOADED, MODEL_REGISTRY_REFRESH_S)
+
+def predict_matrix(features):
+    return current.scorer.predict(features)
+
+batcher = MicroBatcher(predict_matrix, MICROBATCH_MAX_ROWS, MICROBATCH_MAX_WAIT_MS) if MICROBATCH_ENABLED else None
+
+startup = {"ready": False, "import_s": None, "model_load_s": None, "warmup_s": None, "error": None}
+
+async def warmup():
+    # push synthetic rows through the same executor lanes, scorer and
+    # Pydantic models live requests use, so first-call costs are paid here
+    started = time.perf_counter()
+    rng = np.random.default_rng(0)
+    for _ in range(WARMUP_ROUNDS):
+        house = House(area=float(rng.uniform(500, 5000)), bedrooms=int(rng.integers(1, 6)), bathrooms=int(rng.integers(1, 4)))
+        await inference.run("single", current.scorer.predict_row, [house.area, house.bedrooms, house.bathrooms], wait=True)
+        if batcher is not None:
+            await inference.track("single", batcher.submit, [house.area, house.bedrooms, house.bathrooms], wait=True)
+    for size in WARMUP_BATCH_SIZES:
+        columns = HouseColumns(
+            area=rng.uniform(500, 5000, size).tolist(),
+            bedrooms=rng.integers(1, 6, size).tolist(),
+            bathrooms=rng.integers(1, 4, size).tolist(),
+        )
+        features = np.column_stack([columns.area, columns.bedrooms, columns.bathrooms]).astype(float)
+        await inference.run("batch", predict_matrix, features, wait=True)
+    startup["warmup_s"] = time.perf_counter() - started
+
+async def run_warmup():
+    try:
+        await warmup()
+        startup["ready"] = True
+    except Exception as exc:
+        startup["error"] = repr(exc)
+
+@asynccontextmanager
+async def lifespan(app):
+    started = time.perf_counter()
+    set_model(await asyncio.to_thread(load_model, MODEL_PATH))
+    startup["model_load_s"] = time.perf_counter() - started
+
+    watcher = None
+    if MODEL_WATCH_INTERVAL > 0:
+        watcher = ModelWatcher(MODEL_PATH, reload_model, MODEL_WATCH_INTERVAL)
+        watcher.start()
+
+    # the server starts accepting connections while warmup runs; load
+    # balancers should route traffic only once /health/ready returns 200
+    warmup_task = asyncio.create_task(run_warmup())
+    yield
+    warmup_task.cancel()
+    if watcher is not None:
+        watcher.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # allow frontend access
 app.add_middleware(
@@ -43,7 +175,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # lets browser clients read the ETag of /model/coefficients
+    expose_headers=["ETag"],
 )
+# per-route latency, status counts and in-flight requests for /metrics
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(QueueFull)
+def inference_queue_full(request: Request, exc: QueueFull):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 # request format
 class House(BaseModel):
@@ -51,13 +195,241 @@ class House(BaseModel):
     bedrooms: int
     bathrooms: int
 
+# columnar batch format: one list per feature, all the same length
+class HouseColumns(BaseModel):
+    area: List[float]
+    bedrooms: List[int]
+    bathrooms: List[int]
+
 @app.get("/")
 def home():
     return {"message": "House Price Prediction API is running 🚀"}
 
+@app.get("/health/live")
+def liveness():
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def readiness():
+    if not startup["ready"]:
+        return JSONResponse(status_code=503, content={"status": "starting", **startup})
+    return {"status": "ready", "model_version": current.version, **startup}
+
 @app.post("/predict")
-def predict_price(data: House):
-    features = np.array([[data.area, data.bedrooms, data.bathrooms]])
-    predicted_price = model.predict(features)[0]
-    
-    return {"predicted_price": round(float(predicted_price), 2)}
+async def predict_price(data: House, request: Request):
+    timer = StageTimer(request)
+    cache_key = (float(data.area), int(data.bedrooms), int(data.bathrooms))
+    cache_generation = prediction_cache.generation
+    cached = prediction_cache.get(cache_key)
+    if cached is not None:
+        timer.done()
+        return {"predicted_price": cached}
+
+    with timer.stage("features"):
+        row = [data.area, data.bedrooms, data.bathrooms]
+    with timer.stage("predict"):
+        if batcher is not None:
+            # batched rows hold slots of the single lane, so its bound and 503 apply here too
+            predicted_price = await inference.track("single", batcher.submit, row)
+        else:
+            predicted_price = await inference.run("single", current.scorer.predict_row, row)
+
+    predicted_price = round(float(predicted_price), 2)
+    prediction_cache.put(cache_key, predicted_price, cache_generation)
+    timer.done()
+    return {"predicted_price": predicted_price}
+
+def score_batch(data, timer):
+    with timer.stage("features"):
+        if isinstance(data, HouseColumns):
+            features = np.column_stack([data.area, data.bedrooms, data.bathrooms]).astype(float)
+        else:
+            features = np.array([[h.area, h.bedrooms, h.bathrooms] for h in data], dtype=float)
+
+    # one vectorized call for the whole batch, rows come back in input order
+    with timer.stage("predict"):
+        return np.round(predict_matrix(features), 2).tolist()
+
+@app.post("/predict/batch")
+async def predict_price_batch(data: Union[List[House], HouseColumns], request: Request):
+    timer = StageTimer(request)
+    if isinstance(data, HouseColumns):
+        n_rows = len(data.area)
+        if len(data.bedrooms) != n_rows or len(data.bathrooms) != n_rows:
+            raise HTTPException(status_code=422, detail="area, bedrooms and bathrooms must have the same length")
+    else:
+        n_rows = len(data)
+
+    if n_rows > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"batch size {n_rows} exceeds the limit of {MAX_BATCH_SIZE}")
+    if n_rows == 0:
+        timer.done()
+        return {"predicted_prices": []}
+
+    predicted_prices = await inference.run("batch", score_batch, data, timer)
+    timer.done()
+    return {"predicted_prices": predicted_prices}
+
+class BodyStreamingResponse(StreamingResponse):
+    # Before ASGI spec 2.4, StreamingResponse also listens for a disconnect on
+    # receive(), which takes the request body messages this endpoint is still
+    # reading and leaves request.stream() waiting forever. A disconnect still
+    # ends the response: request.stream() raises ClientDisconnect.
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+@app.post("/predict/stream")
+async def predict_price_stream(request: Request):
+    # NDJSON (one house object per line) or CSV with an area,bedrooms,bathrooms header;
+    # results stream back as NDJSON while the body is still being read
+    content_type = request.headers.get("content-type", "")
+    parse = CsvRows() if "csv" in content_type else parse_ndjson
+    results = score_stream(
+        iter_lines(request.stream()),
+        parse,
+        lambda record: House(**record),
+        # the response is already streaming, so wait for a batch slot instead of failing
+        lambda features: inference.run("batch", predict_matrix, features, wait=True),
+        STREAM_CHUNK_ROWS,
+    )
+    return BodyStreamingResponse(results, media_type="application/x-ndjson")
+
+@app.get("/predict/batching")
+def batching_stats():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+@app.get("/predict/cache")
+def cache_stats():
+    return prediction_cache.stats()
+
+@app.get("/model")
+def model_info():
+    return {**current.info(), "reload": reload_status}
+
+def etag_matches(if_none_match, etag):
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+@app.get("/model/coefficients")
+def model_coefficients(if_none_match: Optional[str] = Header(default=None)):
+    # read once: a concurrent reload swaps current, never mutates it
+    loaded = current
+    if loaded.coefficients is None:
+        # cacheable, so clients of a non-linear model do not ask on every use
+        raise HTTPException(
+            status_code=404,
+            detail=f"{type(loaded.model).__name__} is not a linear model, use /predict",
+            headers={"Cache-Control": f"public, max-age={COEFFICIENTS_NOT_LINEAR_MAX_AGE}"},
+        )
+    headers = {"ETag": loaded.coefficients_etag, "Cache-Control": COEFFICIENTS_CACHE_CONTROL}
+    if etag_matches(if_none_match, loaded.coefficients_etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=loaded.coefficients, media_type="application/json", headers=headers)
+
+@app.post("/admin/reload", status_code=202)
+def admin_reload(x_admin_token: Optional[str] = Header(default=None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="admin endpoint disabled, set ADMIN_TOKEN to enable it")
+    if not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="invalid admin token")
+    if reload_lock.locked():
+        return {"status": "already reloading"}
+    threading.Thread(target=reload_model, name="model-reload", daemon=True).start()
+    return {"status": "reloading", "current_version": current.version}
+
+@app.get("/models")
+def list_models():
+    available = {}
+    for name in model_registry.names():
+        available[name] = model_registry.versions(name)
+    return {"models": available, "loaded": model_registry.loaded()}
+
+def score_registered(name, version, data):
+    try:
+        entry = model_registry.get(name, version)
+    except ModelNotFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+    rows = data if isinstance(data, list) else [data]
+    if len(rows) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"batch size {len(rows)} exceeds the limit of {MAX_BATCH_SIZE}")
+    try:
+        features = np.array([entry.feature_row(row) for row in rows], dtype=float)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors())
+
+    predictions = [entry.format(p) for p in entry.loaded.scorer.predict(features)] if rows else []
+    result = {"model": name, "version": entry.version}
+    if isinstance(data, list):
+        result[f"{entry.output}s"] = predictions
+    else:
+        result[entry.output] = predictions[0]
+    return result
+
+@app.post("/models/{name}/predict")
+async def predict_registered(name: str, data: Union[List[Dict[str, Any]], Dict[str, Any]], version: Optional[str] = None):
+    lane = "batch" if isinstance(data, list) else "single"
+    return await inference.run(lane, score_registered, name, version, data)
+
+@app.get("/predict/executor")
+def executor_stats():
+    return inference.stats()
+
+def collect_service_metrics():
+    cache = prediction_cache.stats()
+    lines = []
+    if current is not None:
+        info = current.info()
+        lines += [
+            "# HELP model_info Currently served model; the value is always 1.",
+            "# TYPE model_info gauge",
+            f'model_info{{version="{info["version"]}",build_hash="{info["build_hash"] or ""}",'
+            f'estimator="{info["estimator"]}",scorer="{info["scorer"]}"}} 1',
+        ]
+    lines.append("# TYPE service_ready gauge")
+    lines.append(f"service_ready {int(startup['ready'])}")
+    lines.append("# TYPE service_startup_seconds gauge")
+    for phase in ("import_s", "model_load_s", "warmup_s"):
+        if startup[phase] is not None:
+            lines.append(f'service_startup_seconds{{phase="{phase[:-2]}"}} {startup[phase]}')
+    lines += [
+        "# TYPE prediction_cache_hits_total counter",
+        f"prediction_cache_hits_total {cache['hits']}",
+        "# TYPE prediction_cache_misses_total counter",
+        f"prediction_cache_misses_total {cache['misses']}",
+    ]
+    # each family's TYPE line and samples must stay together
+    lanes = inference.stats()
+    lines.append("# TYPE inference_queue_pending gauge")
+    for lane, stats in lanes.items():
+        lines.append(f'inference_queue_pending{{lane="{lane}"}} {stats["pending"]}')
+    lines.append("# TYPE inference_queue_rejected_total counter")
+    for lane, stats in lanes.items():
+        lines.append(f'inference_queue_rejected_total{{lane="{lane}"}} {stats["rejected"]}')
+    if batcher is not None:
+        stats = batcher.stats()
+        lines += [
+            "# TYPE microbatch_batches_total counter",
+            f"microbatch_batches_total {stats['batches']}",
+            "# TYPE microbatch_rows_total counter",
+            f"microbatch_rows_total {stats['rows']}",
+            "# TYPE microbatch_queue_delay_max_seconds gauge",
+            f"microbatch_queue_delay_max_seconds {stats['max_queue_delay_ms'] / 1000.0}",
+        ]
+    return lines
+
+metrics_registry.add_collector(collect_service_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+startup["import_s"] = time.perf_counter() - IMPORT_STARTED
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+import joblib
+import numpy as np
+
+from scoring import LinearScorer, make_scorer
+
+# feature order of models that do not record it
+DEFAULT_FEATURES = ["area", "bedrooms", "bathrooms"]
+
+
+class LoadedModel:
+    """A model together with its scorer and version, swapped in as one object."""
+
+    def __init__(self, model, version, path, metadata=None):
+        self.model = model
+        self.scorer = make_scorer(model)
+        self.version = version
+        self.path = path
+        self.loaded_at = time.time()
+        self.n_features = int(getattr(model, "n_features_in_", 3))
+        # training metadata written next to the artifact by trainmodel.py
+        self.metadata = metadata or {}
+        # built once per model, so /model/coefficients only compares ETags
+        self.coefficients, self.coefficients_etag = describe_linear(self)
+
+    def info(self):
+        return {
+            "version": self.version,
+            "path": self.path,
+            "estimator": type(self.model).__name__,
+            "scorer": type(self.scorer).__name__,
+            "loaded_at": self.loaded_at,
+            "build_hash": self.metadata.get("build_hash"),
+            "trained_at": self.metadata.get("trained_at"),
+        }
+
+
+def feature_names(loaded):
+    names = loaded.metadata.get("features")
+    if names is None and hasattr(loaded.model, "feature_names_in_"):
+        names = [str(name) for name in loaded.model.feature_names_in_]
+    return list(names or DEFAULT_FEATURES)
+
+
+def describe_linear(loaded):
+    """Serialized coefficients of a linear model and their strong ETag.
+
+    Everything a client needs to compute intercept + coef . x itself, or
+    (None, None) when the model is not linear and must be served remotely.
+    """
+    if not isinstance(loaded.scorer, LinearScorer):
+        return None, None
+    body = json.dumps({
+        "version": loaded.version,
+        "build_hash": loaded.metadata.get("build_hash"),
+        "estimator": type(loaded.model).__name__,
+        "features": feature_names(loaded),
+        "coefficients": loaded.scorer.coef.tolist(),
+        "intercept": loaded.scorer.intercept,
+    }, separators=(",", ":")).encode()
+    return body, '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def warm(loaded, batch_size=64):
+    # run the single-row and batch paths once so first-call costs are paid here
+    row = np.ones(loaded.n_features, dtype=np.float64)
+    loaded.scorer.predict_row(row)
+    loaded.scorer.predict(np.ones((batch_size, loaded.n_features), dtype=np.float64))
+
+
+def file_hash(path, length=12):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+
+def metadata_path(path):
+    # model.pkl and model.joblib share model.json
+    return os.path.splitext(path)[0] + ".json"
+
+
+def read_metadata(path):
+    try:
+        with open(metadata_path(path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def read_model(path):
+    if path.endswith(".joblib"):
+        # arrays stay in the page cache and are shared by every process
+        return joblib.load(path, mmap_mode="r")
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_model(path):
+    loaded = LoadedModel(read_model(path), file_hash(path), path, read_metadata(path))
+    warm(loaded)
+    return loaded
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ModelWatcher(threading.Thread):
+    """Polls the model file and calls on_change(path) when it is rewritten.
+
+    on_change returns False when it could not act on the change (another
+    reload was running); the file then counts as unseen and is retried.
+    """
+
+    def __init__(self, path, on_change, interval=2.0):
+        super().__init__(name="model-watcher", daemon=True)
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._halt = threading.Event()
+
+    def run(self):
+        last = file_signature(self.path)
+        while not self._halt.wait(self.interval):
+            current = file_signature(self.path)
+            if current is None or current == last:
+                continue
+            # wait for the writer to finish before loading
+            time.sleep(self.interval / 4)
+            if file_signature(self.path) != current:
+                continue
+            if self.on_change(self.path) is not False:
+                last = current
+
+    def stop(self):
+        self._halt.set()
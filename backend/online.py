@@ -0,0 +1,181 @@
+"""Online updates of the house-price model from a sold-price feedback file.
+
+    python online.py --feedback feedback.ndjson --interval 5 --publish-every 60
+
+The feedback file is appended to by whatever records sales, one row per
+line, either NDJSON ({"area": ..., "bedrooms": ..., "bathrooms": ..., "price": ...})
+or CSV with a header. New rows are folded into running regression statistics,
+so an update costs O(rows * features^2) no matter how long the history is.
+A refreshed model is written to model.pkl/model.joblib periodically; run the
+API with MODEL_WATCH_INTERVAL set and it reloads the model without a restart.
+"""
+
+import argparse
+import csv
+import hashlib
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from regression_stats import RegressionStats
+from streaming import parse_ndjson
+from trainmodel import FEATURES, TARGET, data, iter_chunks, model_metadata, replace_file, write_artifacts
+
+
+class OnlineTrainer:
+    """Running statistics plus the read position in the feedback file.
+
+    Both are saved together in one .npz file, so a restart neither loses nor
+    double-counts rows.
+    """
+
+    def __init__(self, state_path, feedback_path):
+        self.state_path = state_path
+        self.feedback_path = feedback_path
+        self.offset = 0
+        self.rejected = 0
+        self.stats = RegressionStats(len(FEATURES))
+        self.header = None
+        if os.path.exists(state_path):
+            with np.load(state_path) as saved:
+                self.stats = RegressionStats.from_arrays(saved)
+                self.offset = int(saved["offset"])
+                self.rejected = int(saved["rejected"])
+
+    def seed(self, path=None, chunksize=100000):
+        """Start from the initial training data so feedback refines, not replaces, it."""
+        if path:
+            for chunk in iter_chunks(path, chunksize):
+                self.add(chunk)
+        else:
+            self.add(pd.DataFrame(data))
+
+    def add(self, df):
+        df = df[FEATURES + [TARGET]].apply(pd.to_numeric, errors="coerce")
+        valid = df.dropna()
+        self.rejected += len(df) - len(valid)
+        self.stats.update(valid[FEATURES].to_numpy(dtype=np.float64), valid[TARGET].to_numpy(dtype=np.float64))
+        return len(valid)
+
+    def _csv_header(self):
+        if self.header is None:
+            with open(self.feedback_path, newline="") as f:
+                self.header = [name.strip() for name in next(csv.reader(f), [])]
+        return self.header
+
+    def poll(self, max_rows):
+        """Fold in up to max_rows complete lines appended since the last poll.
+
+        Returns (lines consumed, rows added); the two differ by rejected
+        lines and the CSV header, so only the first says whether the file
+        has been drained.
+        """
+        if not os.path.exists(self.feedback_path):
+            return 0, 0
+        with open(self.feedback_path, "rb") as f:
+            f.seek(self.offset)
+            lines = []
+            while len(lines) < max_rows:
+                line = f.readline()
+                # a line without its newline is still being written
+                if not line.endswith(b"\n"):
+                    break
+                lines.append(line)
+        consumed = len(lines)
+        if not lines:
+            return 0, 0
+
+        is_csv = self.feedback_path.endswith(".csv")
+        if is_csv and self.offset == 0:
+            # first line of a CSV file is the header, not a row
+            self.offset += len(lines[0])
+            lines = lines[1:]
+        rows = []
+        for line in lines:
+            try:
+                rows.append(self._parse(line.decode("utf-8"), is_csv))
+            except (ValueError, TypeError, KeyError):
+                # undecodable, not an object, wrong columns or non-numeric
+                self.rejected += 1
+        # consumed either way, so a bad line cannot stop the daemon on every restart
+        self.offset += sum(len(line) for line in lines)
+        if not rows:
+            return consumed, 0
+        return consumed, self.add(pd.DataFrame(rows, columns=FEATURES + [TARGET]))
+
+    def _parse(self, line, is_csv):
+        """One feedback line as floats in FEATURES + [TARGET] order."""
+        if is_csv:
+            header = self._csv_header()
+            values = next(csv.reader([line]))
+            if len(values) != len(header):
+                raise ValueError(f"expected {len(header)} columns, got {len(values)}")
+            record = dict(zip(header, values))
+        else:
+            record = parse_ndjson(line)
+        values = [float(record[name]) for name in FEATURES + [TARGET]]
+        if not all(math.isfinite(value) for value in values):
+            raise ValueError("non-finite value")
+        return values
+
+    def _write_state(self, path):
+        with open(path, "wb") as f:
+            np.savez(f, offset=self.offset, rejected=self.rejected, **self.stats.to_arrays())
+
+    def save(self):
+        replace_file(self._write_state, self.state_path)
+
+    def publish(self):
+        model = self.stats.to_model(FEATURES)
+        digest = hashlib.sha256(b"".join(a.tobytes() for a in self.stats.to_arrays().values())).hexdigest()
+        metadata = model_metadata(digest, model, digest)
+        metadata["rows"] = self.stats.n
+        write_artifacts(model, metadata)
+        return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feedback", default="feedback.ndjson", help="NDJSON or CSV file that sold prices are appended to")
+    parser.add_argument("--state", default="online_state.npz", help="running statistics and read position")
+    parser.add_argument("--seed-data", help="CSV or Parquet training data to start from (default: the example data)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="maximum rows folded in per poll")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between polls of the feedback file")
+    parser.add_argument("--publish-every", type=float, default=60.0, help="seconds between model refreshes")
+    parser.add_argument("--once", action="store_true", help="consume what is there, publish and exit")
+    args = parser.parse_args()
+
+    trainer = OnlineTrainer(args.state, args.feedback)
+    unpublished = 0
+    if trainer.stats.n == 0:
+        trainer.seed(args.seed_data)
+        trainer.save()
+        unpublished = trainer.stats.n
+        print(f"Seeded running statistics with {trainer.stats.n} rows")
+
+    last_publish = 0.0
+    while True:
+        offset = trainer.offset
+        consumed, added = trainer.poll(args.batch_size)
+        if trainer.offset != offset:
+            trainer.save()
+        unpublished += added
+        drained = consumed < args.batch_size
+
+        if unpublished and (args.once and drained or time.monotonic() - last_publish >= args.publish_every):
+            trainer.publish()
+            last_publish = time.monotonic()
+            print(f"Published model from {trainer.stats.n} rows ({unpublished} new, {trainer.rejected} rejected so far)")
+            unpublished = 0
+
+        if args.once and drained:
+            break
+        if drained:
+            time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
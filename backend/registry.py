@@ -0,0 +1,215 @@
+"""Registry of named, versioned models served from one process.
+
+Artifacts live in a directory tree:
+
+    models/
+        house/1/model.joblib    house/1/schema.json
+        wine/3/model.pkl        wine/3/schema.json
+        weather/1/model.joblib  weather/1/schema.json
+
+schema.json describes the inputs and the response field, for example
+{"features": {"alcohol": "float", "density": "float", "pH": "float"},
+ "output": "predicted_quality", "round": 2}
+
+Models are loaded on first use and the least recently used ones are evicted
+once more than max_loaded are in memory. The version list of a model is
+cached and rescanned only when its directory's mtime has changed, which is
+checked at most every refresh_interval seconds.
+"""
+
+import json
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+import joblib
+from pydantic import create_model
+
+from model_store import LoadedModel, file_hash, read_metadata, read_model, warm
+
+ARTIFACT_NAMES = ("model.joblib", "model.pkl")
+FIELD_TYPES = {"float": float, "int": int}
+
+# schemas for the models in this repo
+HOUSE_SCHEMA = {
+    "features": {"area": "float", "bedrooms": "int", "bathrooms": "int"},
+    "output": "predicted_price",
+    "round": 2,
+}
+WINE_SCHEMA = {
+    "features": {"alcohol": "float", "density": "float", "pH": "float"},
+    "output": "predicted_quality",
+    "round": 2,
+}
+WEATHER_SCHEMA = {
+    "features": {"temp_max": "float", "temp_min": "float"},
+    "output": "predicted_wind",
+    "round": 2,
+}
+
+
+class ModelNotFound(LookupError):
+    pass
+
+
+def version_key(version):
+    # numeric versions sort numerically, anything else after them by name
+    return (0, int(version), "") if version.isdigit() else (1, 0, version)
+
+
+class RegisteredModel:
+    def __init__(self, name, version, loaded, schema):
+        self.name = name
+        self.version = version
+        self.loaded = loaded
+        self.features = list(schema["features"])
+        self.output = schema.get("output", "prediction")
+        self.digits = schema.get("round")
+        self.input_model = create_model(
+            f"{name.capitalize()}Input",
+            **{field: (FIELD_TYPES[kind], ...) for field, kind in schema["features"].items()},
+        )
+
+    def feature_row(self, record):
+        item = self.input_model(**record)
+        return [getattr(item, field) for field in self.features]
+
+    def format(self, value):
+        value = float(value)
+        return round(value, self.digits) if self.digits is not None else value
+
+
+class ModelRegistry:
+    def __init__(self, root, max_loaded=4, refresh_interval=1.0):
+        self.root = root
+        self.max_loaded = max_loaded
+        self.refresh_interval = refresh_interval
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+        # name -> (checked at, directory mtime, sorted versions)
+        self._versions = {}
+
+    def names(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith(".") and os.path.isdir(os.path.join(self.root, name))
+        )
+
+    def versions(self, name):
+        """Versions of name, oldest first, as a tuple.
+
+        publish_model renames a finished version into place, which changes
+        the model directory's mtime, so an unchanged mtime means an
+        unchanged version list and no rescan.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(name)
+        if cached is not None and now - cached[0] < self.refresh_interval:
+            return cached[2]
+        directory = os.path.join(self.root, name)
+        try:
+            info = os.stat(directory)
+        except OSError:
+            info = None
+        if info is None or not stat.S_ISDIR(info.st_mode):
+            with self._lock:
+                self._versions.pop(name, None)
+            raise ModelNotFound(f"unknown model {name!r}")
+        if cached is not None and cached[1] == info.st_mtime_ns:
+            versions = cached[2]
+        else:
+            versions = tuple(sorted(
+                (v for v in os.listdir(directory) if not v.startswith(".") and self._artifact(name, v)),
+                key=version_key,
+            ))
+        with self._lock:
+            self._versions[name] = (now, info.st_mtime_ns, versions)
+        return versions
+
+    def _artifact(self, name, version):
+        for artifact in ARTIFACT_NAMES:
+            path = os.path.join(self.root, name, version, artifact)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def resolve(self, name, version=None):
+        versions = self.versions(name)
+        if not versions:
+            raise ModelNotFound(f"model {name!r} has no versions")
+        if version is None or version == "latest":
+            return versions[-1]
+        if version not in versions:
+            raise ModelNotFound(f"model {name!r} has no version {version!r}")
+        return version
+
+    def get(self, name, version=None):
+        key = (name, self.resolve(name, version))
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is not None:
+                self._loaded.move_to_end(key)
+                return entry
+            # one loader per key, other callers wait for it instead of loading twice
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._loaded.get(key)
+            if entry is None:
+                entry = self._load(*key)
+                with self._lock:
+                    self._loaded[key] = entry
+                    self._loaded.move_to_end(key)
+                    while len(self._loaded) > self.max_loaded:
+                        self._loaded.popitem(last=False)
+                    self._loading.pop(key, None)
+        return entry
+
+    def _load(self, name, version):
+        path = self._artifact(name, version)
+        with open(os.path.join(self.root, name, version, "schema.json")) as f:
+            schema = json.load(f)
+        loaded = LoadedModel(read_model(path), file_hash(path), path, read_metadata(path))
+        warm(loaded)
+        return RegisteredModel(name, version, loaded, schema)
+
+    def loaded(self):
+        with self._lock:
+            return [{"name": name, "version": version} for name, version in self._loaded]
+
+
+def latest_metadata(root, name):
+    registry = ModelRegistry(root)
+    try:
+        version = registry.resolve(name)
+    except ModelNotFound:
+        return {}
+    return read_metadata(registry._artifact(name, version))
+
+
+def publish_model(root, name, model, schema, version=None, metadata=None):
+    """Write model and schema as a new version under root/name and return the version."""
+    directory = os.path.join(root, name)
+    os.makedirs(directory, exist_ok=True)
+    if version is None:
+        existing = [int(v) for v in os.listdir(directory) if v.isdigit()]
+        version = str(max(existing, default=0) + 1)
+    # write into a hidden directory and rename it, so readers never see a
+    # version without its schema
+    staging = os.path.join(directory, f".{version}.tmp")
+    os.makedirs(staging, exist_ok=True)
+    joblib.dump(model, os.path.join(staging, "model.joblib"), compress=0)
+    with open(os.path.join(staging, "schema.json"), "w") as f:
+        json.dump(schema, f, indent=2)
+    if metadata is not None:
+        with open(os.path.join(staging, "model.json"), "w") as f:
+            json.dump(metadata, f, indent=2)
+    os.rename(staging, os.path.join(directory, version))
+    return version
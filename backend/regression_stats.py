@@ -0,0 +1,86 @@
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+
+class RegressionStats:
+    """Sufficient statistics for ordinary least squares with an intercept.
+
+    Rows are folded in with update() in O(rows * features^2), so a model can
+    be fitted from data that never sits in memory at once, and new rows can
+    be added later without revisiting old ones. Sums are kept relative to a
+    shift taken from the first rows, which avoids the cancellation error of
+    raw X^T X on large, uncentered features.
+    """
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.n = 0
+        self.shift_x = None
+        self.shift_y = 0.0
+        self.sum_x = np.zeros(n_features)
+        self.sum_y = 0.0
+        self.xtx = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+
+    def update(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(y) == 0:
+            return self
+        if self.shift_x is None:
+            self.shift_x = X.mean(axis=0)
+            self.shift_y = float(y.mean())
+        dx = X - self.shift_x
+        dy = y - self.shift_y
+        self.n += len(y)
+        self.sum_x += dx.sum(axis=0)
+        self.sum_y += float(dy.sum())
+        self.xtx += dx.T @ dx
+        self.xty += dx.T @ dy
+        return self
+
+    def solve(self):
+        if self.n == 0:
+            raise ValueError("no rows have been added")
+        mean_dx = self.sum_x / self.n
+        mean_dy = self.sum_y / self.n
+        # centered cross-products, then the minimum-norm least-squares
+        # solution, the same one LinearRegression finds
+        cxx = self.xtx - self.n * np.outer(mean_dx, mean_dx)
+        cxy = self.xty - self.n * mean_dx * mean_dy
+        coef = np.linalg.lstsq(cxx, cxy, rcond=None)[0]
+        intercept = (self.shift_y + mean_dy) - (self.shift_x + mean_dx) @ coef
+        return coef, float(intercept)
+
+    def to_model(self, feature_names):
+        """A fitted LinearRegression with the solved coefficients."""
+        coef, intercept = self.solve()
+        model = LinearRegression()
+        model.coef_ = coef
+        model.intercept_ = intercept
+        model.n_features_in_ = self.n_features
+        model.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        return model
+
+    def to_arrays(self):
+        return {
+            "n": np.array(self.n),
+            "shift_x": self.shift_x if self.shift_x is not None else np.zeros(self.n_features),
+            "shift_y": np.array(self.shift_y),
+            "sum_x": self.sum_x,
+            "sum_y": np.array(self.sum_y),
+            "xtx": self.xtx,
+            "xty": self.xty,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        stats = cls(len(arrays["sum_x"]))
+        stats.n = int(arrays["n"])
+        stats.shift_x = np.array(arrays["shift_x"], dtype=np.float64) if stats.n else None
+        stats.shift_y = float(arrays["shift_y"])
+        stats.sum_x = np.array(arrays["sum_x"], dtype=np.float64)
+        stats.sum_y = float(arrays["sum_y"])
+        stats.xtx = np.array(arrays["xtx"], dtype=np.float64)
+        stats.xty = np.array(arrays["xty"], dtype=np.float64)
+        return stats
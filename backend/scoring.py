@@ -0,0 +1,81 @@
+import pickle
+import threading
+
+import numpy as np
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+
+# estimators whose predict() is exactly X @ coef_ + intercept_
+LINEAR_MODELS = (LinearRegression, Ridge, Lasso, ElasticNet)
+
+
+class LinearScorer:
+    """Scores linear models with a dot product instead of model.predict.
+
+    coef_ and intercept_ are extracted once at load time. Single rows are
+    written into a preallocated per-thread buffer, batches use one
+    matrix-vector product.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.coef = np.asarray(model.coef_, dtype=np.float64)
+        self.intercept = float(model.intercept_)
+        self.n_features = self.coef.shape[0]
+        self._local = threading.local()
+
+    def _row_buffer(self):
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = np.empty(self.n_features, dtype=np.float64)
+        return row
+
+    def predict_row(self, values):
+        row = self._row_buffer()
+        row[:] = values
+        return float(row.dot(self.coef)) + self.intercept
+
+    def predict(self, features):
+        return np.asarray(features, dtype=np.float64).dot(self.coef) + self.intercept
+
+
+class SklearnScorer:
+    """Fallback for any other estimator: defers to model.predict."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict_row(self, values):
+        return float(self.model.predict(np.array([values], dtype=np.float64))[0])
+
+    def predict(self, features):
+        return self.model.predict(features)
+
+
+def make_scorer(model):
+    coef = getattr(model, "coef_", None)
+    if isinstance(model, LINEAR_MODELS) and coef is not None and np.ndim(coef) == 1:
+        return LinearScorer(model)
+    return SklearnScorer(model)
+
+
+def check_parity(model, features, rtol=1e-9, atol=1e-6):
+    """Raise AssertionError if the scorer disagrees with model.predict on features."""
+    scorer = make_scorer(model)
+    expected = model.predict(features)
+    np.testing.assert_allclose(scorer.predict(features), expected, rtol=rtol, atol=atol)
+    single = [scorer.predict_row(row) for row in features]
+    np.testing.assert_allclose(single, expected, rtol=rtol, atol=atol)
+    return scorer
+
+
+if __name__ == "__main__":
+    # parity check of the fast path against sklearn on random inputs
+    model = pickle.load(open("model.pkl", "rb"))
+    rng = np.random.default_rng(0)
+    features = np.column_stack([
+        rng.uniform(300, 6000, 1000),
+        rng.integers(1, 8, 1000),
+        rng.integers(1, 6, 1000),
+    ]).astype(np.float64)
+    scorer = check_parity(model, features)
+    print(f"{type(scorer).__name__} matches {type(model).__name__}.predict on {len(features)} rows")
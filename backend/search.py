@@ -0,0 +1,234 @@
+"""Cross-validated search over model families and hyperparameters.
+
+    python search.py                         # example data
+    python search.py --data listings.csv --folds 5 --workers 8
+
+Every (candidate, fold) fit runs in a process pool and its scores are cached
+on disk under --cache-dir, keyed by the data hash and the parameters, so a
+rerun only fits what changed. The best candidate by mean RMSE is refitted on
+all rows and exported like trainmodel.py does, next to a leaderboard of
+accuracy and inference latency. Latency is measured only for the
+--finalists best candidates, one at a time after the pool has finished, so
+it is not skewed by other workers fitting on the same cores.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, ParameterGrid
+
+from trainmodel import FEATURES, TARGET, build_hash, data, model_metadata, save_model
+
+FAMILIES = {
+    "linear_regression": (LinearRegression, {}),
+    "ridge": (Ridge, {"alpha": [0.1, 1.0, 10.0, 100.0]}),
+    "random_forest": (RandomForestRegressor, {
+        "n_estimators": [100, 300], "max_depth": [None, 10], "random_state": [0],
+    }),
+    "gradient_boosting": (GradientBoostingRegressor, {
+        "n_estimators": [100, 300], "learning_rate": [0.05, 0.1], "max_depth": [2, 3], "random_state": [0],
+    }),
+}
+
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+if XGBRegressor is not None:
+    FAMILIES["xgboost"] = (XGBRegressor, {
+        "n_estimators": [200, 400], "learning_rate": [0.05, 0.1], "max_depth": [3, 6], "random_state": [0],
+    })
+
+# set in each worker process by init_worker so the data is sent once per process
+_X = None
+_y = None
+
+
+def init_worker(X, y):
+    global _X, _y
+    _X, _y = X, y
+
+
+def data_hash(df):
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()
+
+
+def candidates():
+    for family, (_, grid) in FAMILIES.items():
+        for params in ParameterGrid(grid):
+            yield family, params
+
+
+def task_key(digest, family, params, folds, fold, seed):
+    payload = json.dumps([digest, family, params, folds, fold, seed], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def time_predict(model, X, repeat=50):
+    row = X[:1]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        model.predict(row)
+    single = (time.perf_counter() - started) / repeat
+    started = time.perf_counter()
+    model.predict(X)
+    per_row = (time.perf_counter() - started) / len(X)
+    return single, per_row
+
+
+def run_fold(family, params, train_index, test_index):
+    estimator, _ = FAMILIES[family]
+    model = estimator(**params)
+    started = time.perf_counter()
+    model.fit(_X[train_index], _y[train_index])
+    fit_s = time.perf_counter() - started
+    predicted = model.predict(_X[test_index])
+    actual = _y[test_index]
+    result = {
+        "rmse": float(np.sqrt(mean_squared_error(actual, predicted))),
+        "mae": float(mean_absolute_error(actual, predicted)),
+        "r2": float(r2_score(actual, predicted)) if len(actual) > 1 else None,
+        "fit_s": fit_s,
+    }
+    return result
+
+
+def load_cached(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return None
+
+
+def store_cached(cache_dir, key, result):
+    path = os.path.join(cache_dir, f"{key}.json")
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(result, f)
+    os.replace(tmp, path)
+
+
+def mean_of(values):
+    values = [v for v in values if v is not None]
+    return float(np.mean(values)) if values else None
+
+
+def measure_finalists(leaderboard, X, y, split, count):
+    """Time inference of the best count candidates, fitted on the first fold."""
+    train_index, test_index = split
+    for row in leaderboard[:count]:
+        estimator, _ = FAMILIES[row["family"]]
+        model = estimator(**row["params"]).fit(X[train_index], y[train_index])
+        single, per_row = time_predict(model, X[test_index])
+        row["predict_single_ms"] = single * 1000.0
+        row["predict_batch_us_per_row"] = per_row * 1e6
+
+
+def search(df, folds, workers, cache_dir, seed=0, finalists=5):
+    os.makedirs(cache_dir, exist_ok=True)
+    X = df[FEATURES].to_numpy(dtype=np.float64)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    digest = data_hash(df[FEATURES + [TARGET]])
+    splits = list(KFold(n_splits=min(folds, len(df)), shuffle=True, random_state=seed).split(X))
+
+    results = {}
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(X, y)) as pool:
+        for family, params in candidates():
+            for fold, (train_index, test_index) in enumerate(splits):
+                key = task_key(digest, family, params, len(splits), fold, seed)
+                cached = load_cached(cache_dir, key)
+                if cached is not None:
+                    results[(family, json.dumps(params, sort_keys=True, default=str), fold)] = cached
+                    continue
+                future = pool.submit(run_fold, family, params, train_index, test_index)
+                pending[future] = (family, params, fold, key)
+
+        print(f"{len(results)} fold results from cache, {len(pending)} to fit on {workers} workers")
+        for future, (family, params, fold, key) in pending.items():
+            result = future.result()
+            store_cached(cache_dir, key, result)
+            results[(family, json.dumps(params, sort_keys=True, default=str), fold)] = result
+
+    leaderboard = []
+    for family, params in candidates():
+        params_key = json.dumps(params, sort_keys=True, default=str)
+        fold_results = [results[(family, params_key, fold)] for fold in range(len(splits))]
+        leaderboard.append({
+            "family": family,
+            "params": params,
+            "rmse": mean_of([r["rmse"] for r in fold_results]),
+            "rmse_std": float(np.std([r["rmse"] for r in fold_results])),
+            "mae": mean_of([r["mae"] for r in fold_results]),
+            "r2": mean_of([r["r2"] for r in fold_results]),
+            "fit_s": mean_of([r["fit_s"] for r in fold_results]),
+            "predict_single_ms": None,
+            "predict_batch_us_per_row": None,
+        })
+    leaderboard.sort(key=lambda row: row["rmse"])
+    # the pool has shut down, so nothing else competes for the cores
+    measure_finalists(leaderboard, X, y, splits[0], finalists)
+    return leaderboard
+
+
+def write_leaderboard(leaderboard, path):
+    with open(f"{path}.json", "w") as f:
+        json.dump(leaderboard, f, indent=2, default=str)
+    columns = ["family", "params", "rmse", "rmse_std", "mae", "r2", "fit_s", "predict_single_ms", "predict_batch_us_per_row"]
+    with open(f"{path}.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in leaderboard:
+            writer.writerow({**row, "params": json.dumps(row["params"], default=str)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", help="CSV or Parquet file with area, bedrooms, bathrooms and price columns")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--cache-dir", default=".search_cache")
+    parser.add_argument("--leaderboard", default="leaderboard", help="output path without extension")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--finalists", type=int, default=5, help="best candidates whose inference latency is timed")
+    parser.add_argument("--no-export", action="store_true", help="only write the leaderboard")
+    args = parser.parse_args()
+
+    if args.data:
+        df = pd.read_parquet(args.data) if args.data.endswith(".parquet") else pd.read_csv(args.data)
+    else:
+        df = pd.DataFrame(data)
+    df = df[FEATURES + [TARGET]].dropna()
+
+    leaderboard = search(df, args.folds, args.workers, args.cache_dir, args.seed, args.finalists)
+    write_leaderboard(leaderboard, args.leaderboard)
+    for rank, row in enumerate(leaderboard[:10], 1):
+        single = f"{row['predict_single_ms']:7.3f}ms" if row["predict_single_ms"] is not None else "      -  "
+        print(f"{rank:2}. {row['family']:18} rmse={row['rmse']:12.2f} r2={row['r2'] if row['r2'] is not None else float('nan'):6.3f} "
+              f"single={single} {json.dumps(row['params'], default=str)}")
+
+    if not args.no_export:
+        best = leaderboard[0]
+        estimator, _ = FAMILIES[best["family"]]
+        model = estimator(**best["params"]).fit(df[FEATURES], df[TARGET])
+        digest = data_hash(df)
+        metadata = model_metadata(build_hash(digest, estimator.__name__, best["params"]), model, digest)
+        version = save_model(model, metadata)
+        published = f"registry version house/{version}" if version else "registry already has this build"
+        print(f"Exported {best['family']} as model.pkl and model.joblib ({published})")
+
+
+if __name__ == "__main__":
+    main()
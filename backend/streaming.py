@@ -0,0 +1,95 @@
+import csv
+import json
+
+import numpy as np
+
+FEATURES = ["area", "bedrooms", "bathrooms"]
+
+
+async def iter_lines(chunks):
+    """Split an async stream of byte chunks into lines, still as bytes.
+
+    Decoding is left to score_stream, so a line that is not valid UTF-8
+    becomes an error for that row only.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending.strip():
+        yield pending.rstrip(b"\r")
+
+
+def parse_ndjson(line):
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("expected a JSON object")
+    return record
+
+
+class CsvRows:
+    """Turns CSV lines into dicts, taking column names from the header line."""
+
+    def __init__(self):
+        self.header = None
+
+    def __call__(self, line):
+        values = next(csv.reader([line]))
+        if self.header is None:
+            self.header = [name.strip() for name in values]
+            return None
+        if len(values) != len(self.header):
+            raise ValueError(f"expected {len(self.header)} columns, got {len(values)}")
+        return dict(zip(self.header, values))
+
+
+async def score_stream(lines, parse, validate, predict, chunk_rows):
+    """Yield one NDJSON result line per input row.
+
+    Rows are validated one at a time and scored chunk_rows at a time, so
+    memory is bounded by the chunk size. lines may be str or UTF-8 bytes;
+    invalid rows, including undecodable ones, produce an inline error line
+    and do not stop the stream. predict is a coroutine function
+    taking a feature matrix, so scoring can happen off the event loop.
+    """
+    # (row number, error message or None) in input order, scored rows have None
+    pending, features = [], []
+    row_number = 0
+
+    async def flush():
+        predictions = iter(())
+        if features:
+            predictions = iter(await predict(np.array(features, dtype=float)))
+        out = []
+        for n, error in pending:
+            if error is None:
+                out.append(json.dumps({"row": n, "predicted_price": round(float(next(predictions)), 2)}))
+            else:
+                out.append(json.dumps({"row": n, "error": error}))
+        pending.clear()
+        features.clear()
+        return "\n".join(out) + "\n"
+
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            record = parse(line)
+            if record is None:
+                continue
+            house = validate(record)
+        except Exception as exc:
+            pending.append((row_number, str(exc)))
+        else:
+            pending.append((row_number, None))
+            features.append([getattr(house, name) for name in FEATURES])
+        row_number += 1
+        if len(pending) >= chunk_rows:
+            yield await flush()
+
+    if pending:
+        yield await flush()
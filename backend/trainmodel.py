@@ -1,7 +1,25 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import shutil
+import time
+
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 import pickle
+import joblib
+import sklearn
+from model_store import file_hash
+from registry import HOUSE_SCHEMA, latest_metadata, publish_model
+from regression_stats import RegressionStats
+
+FEATURES = ["area", "bedrooms", "bathrooms"]
+TARGET = "price"
+ARTIFACTS = ("model.pkl", "model.joblib")
 
 # Example training data
 data = {
@@ -11,15 +29,163 @@ data = {
     "price": [120000, 180000, 150000, 240000, 270000]
 }
 
-df = pd.DataFrame(data)
 
-X = df[["area", "bedrooms", "bathrooms"]]
-y = df["price"]
+def train_in_memory(df):
+    X = df[FEATURES]
+    y = df[TARGET]
+
+    model = LinearRegression()
+    model.fit(X, y)
+    return model
+
+
+def iter_chunks(path, chunksize):
+    # CSV and Parquet are both read chunksize rows at a time, only the
+    # feature and target columns are materialized
+    columns = FEATURES + [TARGET]
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+def train_out_of_core(path, chunksize):
+    # memory is bounded by one chunk plus a features x features matrix
+    stats = RegressionStats(len(FEATURES))
+    for chunk in iter_chunks(path, chunksize):
+        chunk = chunk.dropna()
+        stats.update(chunk[FEATURES].to_numpy(dtype=np.float64), chunk[TARGET].to_numpy(dtype=np.float64))
+    print(f"Accumulated {stats.n} rows from {path}")
+    return stats.to_model(FEATURES)
+
+
+def dataframe_digest(df):
+    return hashlib.sha256(pd.util.hash_pandas_object(df[FEATURES + [TARGET]], index=False).values.tobytes()).hexdigest()
+
+
+def build_hash(data_digest, estimator, params):
+    """Content address of a training run: same inputs, same model."""
+    key = {
+        "data": data_digest,
+        "features": FEATURES,
+        "target": TARGET,
+        "estimator": estimator,
+        "params": params,
+        "versions": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sklearn": sklearn.__version__,
+            "joblib": joblib.__version__,
+        },
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def model_metadata(key, model, data_digest):
+    return {
+        "build_hash": key,
+        "data_digest": data_digest,
+        "estimator": type(model).__name__,
+        "features": FEATURES,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def replace_file(write, path):
+    # write next to the target and rename, so the API's file watcher never
+    # loads a half-written model
+    tmp = f"{path}.tmp{os.getpid()}"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def write_metadata(metadata, path):
+    with open(path, "w") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def write_artifacts(model, metadata, directory="."):
+    # metadata first, so whichever artifact the API reloads finds matching metadata
+    replace_file(lambda p: write_metadata(metadata, p), os.path.join(directory, "model.json"))
+    # Save model
+    replace_file(lambda p: pickle.dump(model, open(p, "wb")), os.path.join(directory, "model.pkl"))
+    # uncompressed joblib keeps the numpy arrays page-aligned so the API can
+    # memory-map them and share the pages between worker processes;
+    # written last because the API serves model.joblib when it exists
+    replace_file(lambda p: joblib.dump(model, p, compress=0), os.path.join(directory, "model.joblib"))
+
+
+def save_model(model, metadata):
+    write_artifacts(model, metadata)
+    # also publish a new version for the multi-model /models/{name}/predict
+    # endpoint, unless the latest version is this exact build
+    latest = latest_metadata("models", "house")
+    if latest.get("build_hash") == metadata["build_hash"]:
+        return None
+    return publish_model("models", "house", model, HOUSE_SCHEMA, metadata=metadata)
+
+
+def cached_build(cache_dir, key):
+    directory = os.path.join(cache_dir, key)
+    if all(os.path.exists(os.path.join(directory, name)) for name in ARTIFACTS + ("model.json",)):
+        return directory
+    return None
+
+
+def restore_build(directory):
+    for name in ("model.json",) + ARTIFACTS:
+        replace_file(lambda p: shutil.copyfile(os.path.join(directory, name), p), name)
+    with open("model.json") as f:
+        return json.load(f)
+
+
+def store_build(cache_dir, key, model, metadata):
+    directory = os.path.join(cache_dir, key)
+    staging = f"{directory}.tmp{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+    write_artifacts(model, metadata, staging)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the house-price model.")
+    parser.add_argument("--data", help="CSV or Parquet file with area, bedrooms, bathrooms and price columns; "
+                                       "streamed in chunks instead of loaded into memory")
+    parser.add_argument("--chunksize", type=int, default=100000, help="rows per chunk with --data")
+    parser.add_argument("--cache-dir", default=".train_cache",
+                        help="content-addressed store of previous builds")
+    parser.add_argument("--force", action="store_true", help="retrain even if a cached build matches")
+    args = parser.parse_args()
+
+    # the key covers the data, features, estimator parameters and library versions
+    if args.data:
+        data_digest = file_hash(args.data, length=64)
+    else:
+        data_digest = dataframe_digest(pd.DataFrame(data))
+    key = build_hash(data_digest, "LinearRegression", LinearRegression().get_params())
+
+    cached = None if args.force else cached_build(args.cache_dir, key)
+    if cached is not None:
+        metadata = restore_build(cached)
+        print(f"Inputs unchanged, reused cached build {key[:12]} (trained {metadata['trained_at']})")
+        return
+
+    if args.data:
+        model = train_out_of_core(args.data, args.chunksize)
+    else:
+        model = train_in_memory(pd.DataFrame(data))
 
-model = LinearRegression()
-model.fit(X, y)
+    metadata = model_metadata(key, model, data_digest)
+    store_build(args.cache_dir, key, model, metadata)
+    version = save_model(model, metadata)
+    published = f"registry version house/{version}" if version else "registry already has this build"
+    print(f"Model trained and saved as model.pkl and model.joblib (build {key[:12]}, {published})")
 
-# Save model
-pickle.dump(model, open("model.pkl", "wb"))
 
-print("Model trained and saved as model.pkl")
+if __name__ == "__main__":
+    main()
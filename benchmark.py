@@ -0,0 +1,105 @@
+"""Rerun-time benchmarks for the Streamlit apps.
+
+Everything runs offline through Streamlit's AppTest harness, no browser or
+server needed. Run from the repository root:
+
+    python benchmark.py rerun                         # 10, 100 and 1000 widgets
+    python benchmark.py rerun --widgets 2000 --reruns 50
+
+Each script is the wine app's sidebar of ten colour pickers plus --widgets
+number inputs, styled either the old way (CSS f-strings rebuilt in every
+run) or through theme.py. Results are written as JSON (--output) so runs
+can be compared between commits.
+"""
+
+import os
+import time
+
+from benchmark_common import make_parser, percentiles, run
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PRELUDE = f"""
+import sys
+sys.path.insert(0, {ROOT!r})
+import streamlit as st
+WIDGETS = {{widgets}}
+"""
+
+LEGACY_SCRIPT = """
+st.markdown('''
+<style>
+h1, h2, h3, h4, h5, h6 { font-family: 'Times New Roman', serif !important; }
+</style>
+''', unsafe_allow_html=True)
+st.sidebar.header("Customize Colors")
+bg_color = st.sidebar.color_picker("Background Color", "#420505")
+text_color = st.sidebar.color_picker("Text Color", "#000000")
+button_color = st.sidebar.color_picker("Button Color", "#4CAF50")
+button_text_color = st.sidebar.color_picker("Button Text Color", "#FFFFFF")
+input_bg_color = st.sidebar.color_picker("Input Box Background", "#FFFFFF")
+input_text_color = st.sidebar.color_picker("Input Text Color", "#000000")
+success_bg_color = st.sidebar.color_picker("Success Box Background", "#D4EDDA")
+success_text_color = st.sidebar.color_picker("Success Text Color", "#155724")
+error_bg_color = st.sidebar.color_picker("Error Box Background", "#F8D7DA")
+error_text_color = st.sidebar.color_picker("Error Text Color", "#721C24")
+st.markdown(f'''
+<style>
+.stApp {{ background-color: {bg_color}; color: {text_color}; }}
+.stButton>button {{ background-color: {button_color}; color: {button_text_color}; }}
+</style>
+''', unsafe_allow_html=True)
+for i in range(WIDGETS):
+    st.number_input(f"Value {i}", value=float(i))
+"""
+
+THEMED_SCRIPT = """
+from theme import apply_theme, theme_from_sidebar
+apply_theme(theme_from_sidebar())
+for i in range(WIDGETS):
+    st.number_input(f"Value {i}", value=float(i))
+"""
+
+
+def time_reruns(script, widgets, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_string(PRELUDE.format(widgets=widgets) + script, default_timeout=60)
+    app.run()
+    samples = []
+    for i in range(reruns):
+        # alternate one widget so every rerun is a real interaction
+        app.number_input[0].set_value(float(i % 2))
+        started = time.perf_counter()
+        app.run()
+        samples.append(time.perf_counter() - started)
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+    return samples
+
+
+def bench_rerun(args):
+    results = []
+    for widgets in args.widgets:
+        for name, script in (("legacy", LEGACY_SCRIPT), ("theme", THEMED_SCRIPT)):
+            samples = time_reruns(script, widgets, args.reruns)
+            row = {"style": name, "widgets": widgets, "mean_ms": sum(samples) / len(samples) * 1000.0,
+                   **percentiles(samples)}
+            print(f"{name:7} widgets={widgets:<6} mean={row['mean_ms']:9.2f}ms p95={row['p95_ms']:9.2f}ms")
+            results.append(row)
+    return results
+
+
+def main():
+    parser, sub = make_parser(__doc__)
+
+    rerun = sub.add_parser("rerun", help="script rerun time with many widgets, legacy CSS versus theme.py")
+    rerun.add_argument("--widgets", type=int, nargs="+", default=[10, 100, 1000])
+    rerun.add_argument("--reruns", type=int, default=20)
+    rerun.set_defaults(run=bench_rerun)
+
+    run(parser)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Pieces shared by the benchmark scripts of this repository.
+
+benchmark.py, backend/benchmark.py and bike-engine-store/benchmark.py each
+define their own subcommands and leave argument parsing, result metadata
+and the JSON output file to this module.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+
+def percentiles(samples, quantiles=(0.50, 0.95, 0.99)):
+    """Percentiles and maximum of durations in seconds, as milliseconds."""
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000.0
+
+    summary = {f"p{round(q * 100)}_ms": pick(q) for q in quantiles}
+    summary["max_ms"] = ordered[-1] * 1000.0
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def make_parser(description):
+    """An argument parser with --output, and its required subcommands."""
+    parser = argparse.ArgumentParser(description=description, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    return parser, parser.add_subparsers(dest="command", required=True)
+
+
+def run(parser):
+    """Run the chosen subcommand's run(args) and write its results as JSON.
+
+    Results carry the commit and Python version, so runs can be compared
+    between commits.
+    """
+    args = parser.parse_args()
+    results = {
+        "command": args.command,
+        "timestamp": time.time(),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "results": args.run(args),
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {args.output}")
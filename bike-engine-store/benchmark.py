@@ -0,0 +1,361 @@
+"""Benchmarks for the bike engine store.
+
+Everything runs offline. Run from bike-engine-store/:
+
+    python benchmark.py cart                          # 100, 1000 and 5000 lines
+    python benchmark.py cart --lines 10000 --reads 5
+    python benchmark.py catalog --engines 50000       # index build and search latency
+    python benchmark.py memory                        # 10k sessions with 20-line carts
+    python benchmark.py checkout --threads 1 4 16     # concurrent checkouts against SQLite
+    python benchmark.py order-ids --ids 1000000       # uniqueness across threads and processes
+
+Results are written as JSON (--output) so runs can be compared between commits.
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from catalog import Catalog, generate_engines, page_of
+from order_ids import new_order_id
+from shoppingcart import Engine, ShoppingCart
+from store import Store
+
+# shared benchmark helpers live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from benchmark_common import make_parser, percentiles, run  # noqa: E402
+
+
+class LegacyEngine:
+    """Engine as it was before: a plain class with a __dict__."""
+
+    def __init__(self, engine_id, name, price, horsepower):
+        self.engine_id = engine_id
+        self.name = name
+        self.price = price
+        self.horsepower = horsepower
+
+
+class LegacyCartItem:
+    def __init__(self, engine, quantity=1):
+        self.engine = engine
+        self.quantity = quantity
+
+    def total_price(self):
+        return self.engine.price * self.quantity
+
+
+class ListCart:
+    """The cart as it was before: a list, scanned on every add and total."""
+
+    def __init__(self, catalog=None):
+        self.items = []
+
+    def add_item(self, engine, quantity=1):
+        for item in self.items:
+            if item.engine.engine_id == engine.engine_id:
+                item.quantity += quantity
+                return
+        self.items.append(LegacyCartItem(engine, quantity))
+
+    def set_quantity(self, engine_id, quantity):
+        for item in self.items:
+            if item.engine.engine_id == engine_id:
+                item.quantity = quantity
+                return
+
+    def remove_item(self, engine_id):
+        self.items = [item for item in self.items if item.engine.engine_id != engine_id]
+
+    def get_total(self):
+        return sum(item.total_price() for item in self.items)
+
+
+def make_engines(count, rng, engine_class=Engine):
+    return [engine_class(i, f"Engine {i}", rng.randrange(20000, 500000, 500), rng.randrange(100, 1200))
+            for i in range(1, count + 1)]
+
+
+def cart_workload(cart_class, engines, reads, rng):
+    """Seconds spent in each phase of a session that fills, edits and empties a cart.
+
+    Every mutation is followed by `reads` get_total() calls, as a Streamlit
+    rerun reads the total several times after each click.
+    """
+    timings = {}
+    cart = cart_class({engine.engine_id: engine for engine in engines})
+
+    started = time.perf_counter()
+    for engine in engines:
+        cart.add_item(engine, 1)
+        for _ in range(reads):
+            cart.get_total()
+    timings["add"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for engine in engines:
+        cart.set_quantity(engine.engine_id, rng.randint(1, 10))
+        for _ in range(reads):
+            cart.get_total()
+    timings["update"] = time.perf_counter() - started
+
+    order = [engine.engine_id for engine in engines]
+    rng.shuffle(order)
+    started = time.perf_counter()
+    for engine_id in order:
+        cart.remove_item(engine_id)
+        for _ in range(reads):
+            cart.get_total()
+    timings["remove"] = time.perf_counter() - started
+    return timings
+
+
+def bench_cart(args):
+    results = []
+    for lines in args.lines:
+        engines = make_engines(lines, random.Random(args.seed))
+        for cart_class in (ListCart, ShoppingCart):
+            timings = cart_workload(cart_class, engines, args.reads, random.Random(args.seed))
+            row = {"cart": cart_class.__name__, "lines": lines, "reads": args.reads,
+                   **{f"{phase}_us_per_op": seconds / lines * 1e6 for phase, seconds in timings.items()}}
+            print(f"{cart_class.__name__:12} lines={lines:<6} " + " ".join(
+                f"{phase}={seconds / lines * 1e6:9.2f}us" for phase, seconds in timings.items()))
+            results.append(row)
+    return results
+
+
+def traced_bytes(build):
+    """Bytes still allocated by build() when it returns, and its result."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(args):
+    results = []
+    rng = random.Random(args.seed)
+    picks = [[rng.randrange(1, args.engines + 1) for _ in range(args.lines)] for _ in range(args.sessions)]
+    for engine_class, cart_class in ((LegacyEngine, ListCart), (Engine, ShoppingCart)):
+        catalog_bytes, engines = traced_bytes(lambda: make_engines(args.engines, random.Random(args.seed), engine_class))
+        by_id = {engine.engine_id: engine for engine in engines}
+
+        def build_sessions():
+            sessions = []
+            for session_picks in picks:
+                cart = cart_class(by_id)
+                for engine_id in session_picks:
+                    cart.add_item(by_id[engine_id], 1)
+                sessions.append(cart)
+            return sessions
+
+        session_bytes, sessions = traced_bytes(build_sessions)
+        row = {"cart": cart_class.__name__, "engine": engine_class.__name__, "engines": args.engines,
+               "sessions": args.sessions, "lines": args.lines, "catalog_bytes": catalog_bytes,
+               "session_bytes": session_bytes, "bytes_per_session": session_bytes / args.sessions}
+        print(f"{cart_class.__name__:12} catalog={catalog_bytes / 2**20:7.2f}MiB "
+              f"sessions={session_bytes / 2**20:7.2f}MiB per_session={row['bytes_per_session']:8.0f}B")
+        results.append(row)
+        del sessions
+    return results
+
+
+CATALOG_QUERIES = [
+    {},
+    {"query": "yam"},
+    {"query": "royal enf 350"},
+    {"query": "ktm twin mk3", "sort": "horsepower", "descending": True},
+    {"price": (50000, 150000)},
+    {"query": "honda", "price": (50000, 150000), "horsepower": (20, 60)},
+]
+
+
+def bench_catalog(args):
+    engines = generate_engines(args.engines, args.seed)
+    started = time.perf_counter()
+    catalog = Catalog(engines)
+    results = {"engines": args.engines, "build_s": time.perf_counter() - started, "queries": []}
+    print(f"built index over {args.engines} engines in {results['build_s'] * 1000:.1f}ms")
+
+    for params in CATALOG_QUERIES:
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            page_of(catalog.search(**params), 1, 12)
+            samples.append(time.perf_counter() - started)
+        row = {"params": params, "matches": len(catalog.search(**params)), **percentiles(samples)}
+        print(f"{json.dumps(params):72} matches={row['matches']:<6} p50={row['p50_ms']:7.2f}ms p95={row['p95_ms']:7.2f}ms")
+        results["queries"].append(row)
+    return results
+
+
+CUSTOMER = {"name": "Bench", "email": "bench@example.com", "phone": "0", "address": "-", "payment_method": "UPI"}
+
+
+def checkout_worker(store, engines, worker, args, timings, placed):
+    rng = random.Random(args.seed + worker)
+    sessions = iter(range(args.orders))
+    # session_id -> (cart, clicks left); clicks go to a random open cart, so
+    # a cart lives across many saves of others and its snapshot is still
+    # queued when the writer flushes, as with real shoppers
+    open_carts = {}
+
+    def open_next():
+        n = next(sessions, None)
+        if n is not None:
+            open_carts[f"bench-{worker}-{n}"] = ({}, args.clicks)
+
+    for _ in range(args.open_carts):
+        open_next()
+    while open_carts:
+        session_id = rng.choice(list(open_carts))
+        cart, left = open_carts.pop(session_id)
+        engine = rng.choice(engines)
+        cart[engine] = cart.get(engine, 0) + rng.randint(1, 3)
+        started = time.perf_counter()
+        store.save_cart(session_id, [(engine.engine_id, quantity) for engine, quantity in cart.items()])
+        timings["save"].append(time.perf_counter() - started)
+        if left > 1:
+            open_carts[session_id] = (cart, left - 1)
+            continue
+        # an abandoned cart is only ever written by the writer thread
+        if rng.random() >= args.abandon:
+            started = time.perf_counter()
+            store.place_order(new_order_id(), session_id, CUSTOMER, list(cart.items()))
+            timings["order"].append(time.perf_counter() - started)
+            placed[worker] += 1
+        open_next()
+
+
+def bench_checkout(args):
+    engines = make_engines(1000, random.Random(args.seed))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for threads in args.threads:
+            store = Store(os.path.join(tmp, f"bench-{threads}.db"), flush_interval=args.flush_interval)
+            timings = {"save": [], "order": []}
+            placed = [0] * threads
+            workers = [
+                threading.Thread(target=checkout_worker, args=(store, engines, worker, args, timings, placed))
+                for worker in range(threads)
+            ]
+            started = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - started
+            # writes whatever is still queued, which counts as one more flush
+            store.close()
+
+            orders, carts = sum(placed), threads * args.orders - sum(placed)
+            if store.order_count() != orders:
+                raise RuntimeError(f"{store.order_count()} orders stored, expected {orders}")
+            if store.cart_count() != carts:
+                raise RuntimeError(f"{store.cart_count()} abandoned carts stored, expected {carts}")
+            row = {"threads": threads, "sessions": threads * args.orders, "orders": orders,
+                   "orders_per_s": orders / elapsed, "saves_per_s": len(timings["save"]) / elapsed,
+                   "flushes": store.flushes, "flushed_carts": store.flushed_carts,
+                   "mean_flush_carts": store.flushed_carts / store.flushes if store.flushes else 0.0,
+                   "largest_flush": store.largest_flush,
+                   "save_cart": percentiles(timings["save"]), "place_order": percentiles(timings["order"])}
+            print(f"threads={threads:<3} orders={orders:<6} {row['orders_per_s']:8.0f} orders/s "
+                  f"save_cart p95={row['save_cart']['p95_ms']:6.3f}ms place_order p95={row['place_order']['p95_ms']:6.2f}ms "
+                  f"flushes={store.flushes} carts/flush={row['mean_flush_carts']:.1f} (max {store.largest_flush})")
+            results.append(row)
+    return results
+
+
+def generate_ids(count):
+    """count ids from this process's generator, checked to be strictly increasing."""
+    ids = [new_order_id() for _ in range(count)]
+    if any(a >= b for a, b in zip(ids, ids[1:])):
+        raise RuntimeError("order ids are not strictly increasing")
+    return ids
+
+
+def bench_order_ids(args):
+    per_worker = args.ids // (args.threads + args.processes)
+    # an id drawn before forking, so children start from the parent's state
+    # and must still not repeat its sequence
+    parent_id = new_order_id()
+    all_ids = [parent_id]
+
+    started = time.perf_counter()
+    thread_ids = [None] * args.threads
+
+    def run(index):
+        thread_ids[index] = generate_ids(per_worker)
+
+    workers = [threading.Thread(target=run, args=(index,)) for index in range(args.threads)]
+    for worker in workers:
+        worker.start()
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    with context.Pool(args.processes) as pool:
+        process_ids = pool.map(generate_ids, [per_worker] * args.processes)
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    for ids in thread_ids + process_ids:
+        all_ids.extend(ids)
+    unique = len(set(all_ids))
+    row = {"threads": args.threads, "processes": args.processes, "ids": len(all_ids), "unique": unique,
+           "ids_per_s": (len(all_ids) - 1) / elapsed, "start_method": context.get_start_method()}
+    print(f"{len(all_ids):,} ids from {args.threads} threads and {args.processes} processes "
+          f"({row['start_method']}) in {elapsed:.2f}s, {row['ids_per_s']:,.0f} ids/s, {len(all_ids) - unique} duplicates")
+    if unique != len(all_ids):
+        raise RuntimeError(f"{len(all_ids) - unique} duplicate order ids")
+    return row
+
+
+def main():
+    parser, sub = make_parser(__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+
+    cart = sub.add_parser("cart", help="add, quantity edit and remove on large carts, list versus indexed cart")
+    cart.add_argument("--lines", type=int, nargs="+", default=[100, 1000, 5000])
+    cart.add_argument("--reads", type=int, default=3, help="get_total() calls after each mutation")
+    cart.set_defaults(run=bench_cart)
+
+    memory = sub.add_parser("memory", help="tracemalloc of catalog and session carts, plain classes versus slotted")
+    memory.add_argument("--sessions", type=int, default=10000)
+    memory.add_argument("--lines", type=int, default=20, help="cart lines per session")
+    memory.add_argument("--engines", type=int, default=50000, help="catalog size")
+    memory.set_defaults(run=bench_memory)
+
+    checkout = sub.add_parser("checkout", help="concurrent checkouts with write-behind cart saves against SQLite")
+    checkout.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    checkout.add_argument("--orders", type=int, default=500, help="shopping sessions per thread")
+    checkout.add_argument("--clicks", type=int, default=5, help="cart changes per session")
+    checkout.add_argument("--open-carts", type=int, default=50, help="sessions shopping at once per thread")
+    checkout.add_argument("--abandon", type=float, default=0.3, help="share of sessions that never check out")
+    checkout.add_argument("--flush-interval", type=float, default=0.02,
+                          help="write-behind delay; shorter than the store's 0.5s so a run sees many flushes")
+    checkout.set_defaults(run=bench_checkout)
+
+    order_ids = sub.add_parser("order-ids", help="generate ids from threads and forked processes, check none repeat")
+    order_ids.add_argument("--ids", type=int, default=2000000, help="total ids to generate")
+    order_ids.add_argument("--threads", type=int, default=4)
+    order_ids.add_argument("--processes", type=int, default=4)
+    order_ids.set_defaults(run=bench_order_ids)
+
+    catalog = sub.add_parser("catalog", help="index build time and search latency on a synthetic catalog")
+    catalog.add_argument("--engines", type=int, default=50000)
+    catalog.add_argument("--repeat", type=int, default=50)
+    catalog.set_defaults(run=bench_catalog)
+
+    run(parser)
+
+
+if __name__ == "__main__":
+    main()
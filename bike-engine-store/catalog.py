@@ -0,0 +1,193 @@
+"""Engine catalog with search, range filters and pagination.
+
+The catalog is read from a CSV file (engine_id,name,price,horsepower) or an
+SQLite database with an `engines` table of the same columns, and indexed
+once; streamlit_app.py keeps one instance per server process. To try it
+with a large catalog:
+
+    python catalog.py --generate engines.csv --count 50000
+    CATALOG_PATH=engines.csv streamlit run streamlit_app.py
+"""
+
+import argparse
+import csv
+import random
+import re
+import sqlite3
+from bisect import bisect_left, bisect_right
+
+from shoppingcart import Engine
+
+# used when no catalog file is configured
+DEFAULT_ENGINES = [
+    Engine(1, "Yamaha 150cc Engine", 55000, 150),
+    Engine(2, "KTM 200cc Engine", 85000, 200),
+    Engine(3, "Royal Enfield 350cc Engine", 120000, 350),
+    Engine(4, "Honda 500cc Engine", 200000, 500),
+]
+
+SORT_KEYS = {
+    "price": lambda engine: engine.price,
+    "horsepower": lambda engine: engine.horsepower,
+}
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+class Catalog:
+    """Engines indexed for lookup by id, name search and range filters.
+
+    - by_id: engine_id -> Engine
+    - a token index (token -> engine ids) with a sorted token list, so each
+      query word matches every token it is a prefix of with one bisect
+    - engines sorted by price and by horsepower, with their keys in parallel
+      lists, so a range filter is two bisects and a slice
+    """
+
+    def __init__(self, engines):
+        self.by_id = {engine.engine_id: engine for engine in engines}
+        self.postings = {}
+        for engine in self.by_id.values():
+            for token in set(tokenize(engine.name)):
+                self.postings.setdefault(token, []).append(engine.engine_id)
+        self.tokens = sorted(self.postings)
+        self.sorted = {}
+        self.keys = {}
+        for field, key in SORT_KEYS.items():
+            ordered = sorted(self.by_id.values(), key=key)
+            self.sorted[field] = ordered
+            self.keys[field] = [key(engine) for engine in ordered]
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __getitem__(self, engine_id):
+        return self.by_id[engine_id]
+
+    def get(self, engine_id):
+        return self.by_id.get(engine_id)
+
+    def bounds(self, field):
+        keys = self.keys[field]
+        return (keys[0], keys[-1]) if keys else (0, 0)
+
+    def prefix_matches(self, prefix):
+        ids = set()
+        start = bisect_left(self.tokens, prefix)
+        for token in self.tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            ids.update(self.postings[token])
+        return ids
+
+    def text_matches(self, query):
+        """Ids of engines whose name has a word starting with each query word."""
+        ids = None
+        # rarest words first, so the running intersection stays small
+        for matches in sorted((self.prefix_matches(word) for word in tokenize(query)), key=len):
+            ids = matches if ids is None else ids & matches
+            if not ids:
+                break
+        return ids
+
+    def in_range(self, field, low=None, high=None):
+        keys = self.keys[field]
+        start = 0 if low is None else bisect_left(keys, low)
+        stop = len(keys) if high is None else bisect_right(keys, high)
+        return self.sorted[field][start:stop]
+
+    def search(self, query="", price=(None, None), horsepower=(None, None), sort="price", descending=False):
+        """Engines matching the query and both ranges, ordered by `sort`."""
+        by_price = self.in_range("price", *price)
+        by_horsepower = self.in_range("horsepower", *horsepower)
+        ids = self.text_matches(query) if query.strip() else None
+
+        # walk the smallest candidate set and test the other conditions
+        candidates = min(by_price, by_horsepower, key=len)
+        if ids is not None and len(ids) < len(candidates):
+            candidates = [self.by_id[engine_id] for engine_id in ids]
+        price_low, price_high = price
+        hp_low, hp_high = horsepower
+        results = [
+            engine for engine in candidates
+            if (ids is None or engine.engine_id in ids)
+            and (price_low is None or engine.price >= price_low)
+            and (price_high is None or engine.price <= price_high)
+            and (hp_low is None or engine.horsepower >= hp_low)
+            and (hp_high is None or engine.horsepower <= hp_high)
+        ]
+        # a slice of the sort index is already in order
+        if candidates is not (by_price if sort == "price" else by_horsepower):
+            results.sort(key=SORT_KEYS[sort])
+        if descending:
+            results.reverse()
+        return results
+
+
+def page_of(results, page, page_size):
+    """The 1-based page of results and the number of pages."""
+    pages = max(1, -(-len(results) // page_size))
+    page = min(max(page, 1), pages)
+    start = (page - 1) * page_size
+    return results[start:start + page_size], pages
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            Engine(int(row["engine_id"]), row["name"], float(row["price"]), int(row["horsepower"]))
+            for row in csv.DictReader(f)
+        ]
+
+
+def read_sqlite(path):
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT engine_id, name, price, horsepower FROM engines").fetchall()
+    return [Engine(int(engine_id), name, float(price), int(hp)) for engine_id, name, price, hp in rows]
+
+
+def load_catalog(path=None):
+    if not path:
+        return Catalog(DEFAULT_ENGINES)
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return Catalog(read_sqlite(path))
+    return Catalog(read_csv(path))
+
+
+BRANDS = ["Yamaha", "KTM", "Royal Enfield", "Honda", "Bajaj", "TVS", "Suzuki", "Kawasaki", "Hero", "Triumph"]
+KINDS = ["Single", "Twin", "Triple", "Inline-Four", "V-Twin", "Parallel-Twin"]
+
+
+def generate_engines(count, seed=0):
+    """Synthetic engines with realistic names, prices and horsepower."""
+    rng = random.Random(seed)
+    engines = []
+    for engine_id in range(1, count + 1):
+        cc = rng.choice([100, 110, 125, 150, 160, 200, 220, 250, 300, 350, 390, 400, 500, 650, 800, 1000, 1200])
+        name = f"{rng.choice(BRANDS)} {cc}cc {rng.choice(KINDS)} Engine Mk{rng.randint(1, 9)}"
+        horsepower = max(5, int(cc * rng.uniform(0.08, 0.2)))
+        price = round(cc * rng.uniform(250, 450), -2)
+        engines.append(Engine(engine_id, name, price, horsepower))
+    return engines
+
+
+def write_csv(engines, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["engine_id", "name", "price", "horsepower"])
+        for engine in engines:
+            writer.writerow([engine.engine_id, engine.name, engine.price, engine.horsepower])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generate", required=True, help="CSV file to write a synthetic catalog to")
+    parser.add_argument("--count", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_csv(generate_engines(args.count, args.seed), args.generate)
+    print(f"Wrote {args.count} engines to {args.generate}")
@@ -0,0 +1,86 @@
+"""Order ids that are unique across threads and processes without coordination.
+
+An id is "OSC" followed by a 26-character ULID: a 48-bit millisecond
+timestamp and 80 random bits in Crockford base32, so ids sort by creation
+time. Within a process ids are strictly increasing. When the clock has not
+moved on since the last id (or went backwards), the previous random part
+is incremented instead of drawing a new one. Separate processes draw their
+random parts independently, so two of them colliding needs 80 random bits
+to line up within the same millisecond.
+"""
+
+import os
+import threading
+import time
+
+PREFIX = "OSC"
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_LENGTH = 26
+RANDOM_BITS = 80
+RANDOM_MAX = (1 << RANDOM_BITS) - 1
+
+
+def encode(value, length=ULID_LENGTH):
+    chars = []
+    for _ in range(length):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def decode(text):
+    value = 0
+    for char in text:
+        value = (value << 5) | ALPHABET.index(char)
+    return value
+
+
+def random_bits():
+    # os.urandom, not the random module: a forked child would replay the
+    # parent's random state
+    return int.from_bytes(os.urandom(RANDOM_BITS // 8), "big")
+
+
+class OrderIdGenerator:
+    """Monotonic ULID-style ids, safe to share between threads."""
+
+    def __init__(self, prefix=PREFIX, clock=time.time_ns):
+        self.prefix = prefix
+        self._clock = clock
+        self._reset()
+        # a forked child must not continue the parent's sequence, nor
+        # inherit a lock some other parent thread was holding
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def next_id(self):
+        with self._lock:
+            now_ms = self._clock() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._last_random = random_bits()
+            elif self._last_random < RANDOM_MAX:
+                self._last_random += 1
+            else:
+                # the random part ran out within one millisecond: borrow the next one
+                self._last_ms += 1
+                self._last_random = random_bits()
+            value = (self._last_ms << RANDOM_BITS) | self._last_random
+        return self.prefix + encode(value)
+
+
+def timestamp_ms(order_id, prefix=PREFIX):
+    """Milliseconds since the epoch at which order_id was generated."""
+    return decode(order_id[len(prefix):]) >> RANDOM_BITS
+
+
+_generator = OrderIdGenerator()
+
+
+def new_order_id():
+    return _generator.next_id()
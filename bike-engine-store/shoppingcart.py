@@ -1,48 +1,108 @@
 #Online Shopping Cart for Bike Engines
 
+from dataclasses import dataclass
+
+
+# slotted and frozen: no per-instance __dict__, and engines can be shared
+# by every session without copies
+@dataclass(frozen=True, slots=True)
 class Engine:
-    def __init__(self, engine_id, name, price, horsepower):
-        self.engine_id = engine_id
-        self.name = name
-        self.price = price
-        self.horsepower = horsepower
+    engine_id: int
+    name: str
+    price: float
+    horsepower: int
 
     def __str__(self):
         return f"{self.engine_id}. {self.name} ({self.horsepower} HP) - ₹{self.price}"
 
+@dataclass(frozen=True, slots=True)
 class CartItem:
-    def __init__(self, engine, quantity=1):
-        self.engine = engine
-        self.quantity = quantity
+    """A cart line refers to its engine by id; the engine stays in the catalog."""
+    engine_id: int
+    quantity: int = 1
 
-    def total_price(self):
-        return self.engine.price * self.quantity
-
-    def __str__(self):
-        return f"{self.engine.name} x {self.quantity} = ₹{self.total_price()}"
+    def total_price(self, engine):
+        return engine.price * self.quantity
 
 class ShoppingCart:
-    def __init__(self):
-        self.items = []
+    """Cart lines keyed by engine_id, kept in the order they were first added.
+
+    Adding, removing and changing the quantity of a line are O(1), and the
+    total and unit count are updated on every change instead of re-summing
+    all lines each time they are read. Engines are looked up by id in
+    `catalog`, any mapping of engine_id to Engine.
+    """
+
+    __slots__ = ("catalog", "items", "total", "count")
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.items = {}
+        self.total = 0
+        self.count = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def lines(self):
+        """(engine, item) for every line, in insertion order."""
+        for item in self.items.values():
+            yield self.catalog[item.engine_id], item
 
     def add_item(self, engine, quantity=1):
-        for item in self.items:
-            if item.engine.engine_id == engine.engine_id:
-                item.quantity += quantity
-                return
-        self.items.append(CartItem(engine, quantity))
+        item = self.items.get(engine.engine_id)
+        self.items[engine.engine_id] = CartItem(engine.engine_id, quantity + (item.quantity if item else 0))
+        self.total += engine.price * quantity
+        self.count += quantity
+
+    def set_quantity(self, engine_id, quantity):
+        item = self.items.get(engine_id)
+        if item is None:
+            return
+        if quantity <= 0:
+            self.remove_item(engine_id)
+            return
+        change = quantity - item.quantity
+        self.items[engine_id] = CartItem(engine_id, quantity)
+        self.total += self.catalog[engine_id].price * change
+        self.count += change
+        self._settle()
 
     def remove_item(self, engine_id):
-        self.items = [item for item in self.items if item.engine.engine_id != engine_id]
+        item = self.items.pop(engine_id, None)
+        if item is not None:
+            self.total -= item.total_price(self.catalog[engine_id])
+            self.count -= item.quantity
+            self._settle()
+
+    def _settle(self):
+        # float prices leave rounding residue in the running total; an
+        # empty cart is exactly zero
+        if not self.items:
+            self.total = 0
+            self.count = 0
+
+    def exact_total(self):
+        """The total re-summed from the lines in whole paise, for amounts that are stored."""
+        return sum(round(engine.price * 100) * item.quantity for engine, item in self.lines()) / 100
 
     def view_cart(self):
         if not self.items:
             return "🛒 Your cart is empty."
-        cart_details = "\n".join([str(item) for item in self.items])
+        cart_details = "\n".join(
+            f"{engine.name} x {item.quantity} = ₹{item.total_price(engine)}" for engine, item in self.lines())
         return f"\n--- Shopping Cart ---\n{cart_details}\n----------------------\nTotal = ₹{self.get_total()}"
 
     def get_total(self):
-        return sum(item.total_price() for item in self.items)
+        return self.total
+
+    def clear_cart(self):
+        self.items = {}
+        self.total = 0
+        self.count = 0
 
 
 # engines available in the store
@@ -51,6 +111,7 @@ engines = [
     Engine(2, "KTM 200cc Engine", 85000, 200),
     Engine(3, "Royal Enfield 350cc Engine", 120000, 350),
     Engine(4, "Honda 500cc Engine", 200000, 500)]
+engines_by_id = {engine.engine_id: engine for engine in engines}
 
 def show_store():
     print("\n=== Available Bike Engines ===")
@@ -58,7 +119,7 @@ def show_store():
         print(engine)
 
 if __name__ == "__main__":
-    cart = ShoppingCart()
+    cart = ShoppingCart(engines_by_id)
 
     while True:
         print("\n===== Online Bike Engine Store =====")
@@ -78,7 +139,7 @@ if __name__ == "__main__":
             try:
                 eng_id = int(input("Enter Engine ID to add: "))
                 quantity = int(input("Enter quantity: "))
-                selected = next((e for e in engines if e.engine_id == eng_id), None)
+                selected = engines_by_id.get(eng_id)
                 if selected:
                     cart.add_item(selected, quantity)
                     print(f" {selected.name} x{quantity} added to cart.")
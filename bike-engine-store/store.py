@@ -0,0 +1,197 @@
+"""Persistent carts and orders in a local SQLite file.
+
+The database runs in WAL mode, so readers never wait for the writer, and
+each thread gets its own connection. Cart changes are write-behind: the
+UI hands over the latest cart of a session and returns at once, and a
+background thread writes the newest snapshot of every changed cart in one
+transaction. Orders are written synchronously, and an order, its lines
+and the removal of the cart are one transaction.
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cart_lines (
+    session_id TEXT NOT NULL,
+    engine_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (session_id, engine_id)
+);
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    customer_name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    address TEXT NOT NULL,
+    payment_method TEXT NOT NULL,
+    total REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS order_lines (
+    order_id TEXT NOT NULL REFERENCES orders (order_id),
+    engine_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    price REAL NOT NULL,
+    quantity INTEGER NOT NULL,
+    PRIMARY KEY (order_id, engine_id)
+);
+"""
+
+
+class Store:
+    """Carts and orders of every session, shared by all threads of a process."""
+
+    def __init__(self, path, flush_interval=0.5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        # session_id -> newest unsaved cart, [(engine_id, quantity), ...]
+        self._pending = {}
+        self._lock = threading.Lock()
+        # serializes flushes and orders, so a flush that already took a
+        # session's snapshot cannot write it back after that session's order
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        # flushes that wrote something, the carts they wrote and the largest one
+        self.flushes = 0
+        self.flushed_carts = 0
+        self.largest_flush = 0
+        # the last error of the background writer, shown by the UI until a
+        # later flush succeeds
+        self.last_error = None
+
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+        self._writer = threading.Thread(target=self._write_behind, name="cart-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # with WAL, NORMAL only risks the last transactions on power loss
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def save_cart(self, session_id, lines):
+        """Queue the cart of a session; only the newest snapshot is written."""
+        with self._lock:
+            self._pending[session_id] = list(lines)
+        self._wake.set()
+
+    def load_cart(self, session_id):
+        with self._lock:
+            pending = self._pending.get(session_id)
+        if pending is not None:
+            return list(pending)
+        rows = self.connection().execute(
+            "SELECT engine_id, quantity FROM cart_lines WHERE session_id = ? ORDER BY position",
+            (session_id,),
+        )
+        return rows.fetchall()
+
+    def _write_carts(self, conn, carts):
+        conn.executemany("DELETE FROM cart_lines WHERE session_id = ?", [(session_id,) for session_id in carts])
+        conn.executemany(
+            "INSERT INTO cart_lines (session_id, engine_id, quantity, position) VALUES (?, ?, ?, ?)",
+            [(session_id, engine_id, quantity, position)
+             for session_id, lines in carts.items()
+             for position, (engine_id, quantity) in enumerate(lines)],
+        )
+
+    def flush(self):
+        """Write every queued cart in one transaction."""
+        with self._write_lock:
+            with self._lock:
+                carts, self._pending = self._pending, {}
+            if not carts:
+                return 0
+            conn = self.connection()
+            try:
+                with conn:
+                    self._write_carts(conn, carts)
+            except sqlite3.Error:
+                # requeue, unless a newer snapshot arrived in the meantime
+                with self._lock:
+                    for session_id, lines in carts.items():
+                        self._pending.setdefault(session_id, lines)
+                raise
+            self.flushes += 1
+            self.flushed_carts += len(carts)
+            self.largest_flush = max(self.largest_flush, len(carts))
+        return len(carts)
+
+    def _write_behind(self):
+        while not self._closed:
+            self._wake.wait()
+            # let more clicks arrive so they share one transaction
+            time.sleep(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                self.last_error = None
+            except sqlite3.Error as exc:
+                self.last_error = exc
+                self._wake.set()
+
+    def place_order(self, order_id, session_id, customer, lines):
+        """Insert an order with its lines and empty the session's cart, atomically.
+
+        customer has name, email, phone, address and payment_method;
+        lines are (engine, quantity) pairs. The stored total is summed from
+        the lines in whole paise, not taken from a running total.
+        """
+        lines = list(lines)
+        total = sum(round(engine.price * 100) * quantity for engine, quantity in lines) / 100
+        with self._write_lock:
+            with self._lock:
+                # the order replaces whatever cart snapshot is still queued
+                pending = self._pending.pop(session_id, None)
+            try:
+                self._insert_order(order_id, session_id, customer, lines, total)
+            except Exception:
+                if pending is not None:
+                    with self._lock:
+                        self._pending.setdefault(session_id, pending)
+                raise
+        return order_id
+
+    def _insert_order(self, order_id, session_id, customer, lines, total):
+        conn = self.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO orders (order_id, session_id, customer_name, email, phone, address, "
+                "payment_method, total, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (order_id, session_id, customer["name"], customer["email"], customer["phone"],
+                 customer["address"], customer["payment_method"], total, time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO order_lines (order_id, engine_id, name, price, quantity) VALUES (?, ?, ?, ?, ?)",
+                [(order_id, engine.engine_id, engine.name, engine.price, quantity) for engine, quantity in lines],
+            )
+            conn.execute("DELETE FROM cart_lines WHERE session_id = ?", (session_id,))
+
+    def order_count(self):
+        return self.connection().execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def cart_count(self):
+        return self.connection().execute("SELECT COUNT(DISTINCT session_id) FROM cart_lines").fetchone()[0]
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=self.flush_interval + 5)
+        self.flush()
@@ -1,5 +1,21 @@
+import html
+import math
+import os
+import sqlite3
+import uuid
+
 import streamlit as st
-from datetime import datetime
+
+from catalog import load_catalog, page_of
+from order_ids import new_order_id
+from shoppingcart import ShoppingCart
+from store import Store
+
+# CSV or SQLite catalog; the four built-in engines when unset
+CATALOG_PATH = os.environ.get("CATALOG_PATH", "")
+PAGE_SIZE = 12
+# SQLite file for carts and orders
+STORE_PATH = os.environ.get("STORE_PATH", "store.db")
 
 # Page configuration
 st.set_page_config(
@@ -43,80 +59,100 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Engine class
-class Engine:
-    def __init__(self, engine_id, name, price, horsepower):
-        self.engine_id = engine_id
-        self.name = name
-        self.price = price
-        self.horsepower = horsepower
+# Initialize session state
+if "checkout_complete" not in st.session_state:
+    st.session_state.checkout_complete = False
 
-    def __str__(self):
-        return f"{self.name} ({self.horsepower} HP) - ₹{self.price:,.0f}"
+@st.cache_resource
+def get_catalog(path):
+    # loaded and indexed once, shared by every session of this process
+    return load_catalog(path)
 
-# CartItem class
-class CartItem:
-    def __init__(self, engine, quantity=1):
-        self.engine = engine
-        self.quantity = quantity
 
-    def total_price(self):
-        return self.engine.price * self.quantity
+def range_slider(label, bounds, step):
+    low, high = math.floor(bounds[0]), math.ceil(bounds[1])
+    return st.slider(label, low, max(high, low + step), (low, max(high, low + step)), step=step)
 
-# ShoppingCart class
-class ShoppingCart:
-    def __init__(self):
-        self.items = []
 
-    def add_item(self, engine, quantity=1):
-        for item in self.items:
-            if item.engine.engine_id == engine.engine_id:
-                item.quantity += quantity
-                return
-        self.items.append(CartItem(engine, quantity))
+@st.cache_resource
+def get_store(path):
+    # one store (and cart writer thread) per server process
+    return Store(path)
 
-    def remove_item(self, engine_id):
-        self.items = [item for item in self.items if item.engine.engine_id != engine_id]
 
-    def get_total(self):
-        return sum(item.total_price() for item in self.items)
+def cart_lines(cart):
+    return tuple((item.engine_id, item.quantity) for item in cart)
 
-    def clear_cart(self):
-        self.items = []
 
-# Initialize session state
-if "cart" not in st.session_state:
-    st.session_state.cart = ShoppingCart()
+catalog = get_catalog(CATALOG_PATH)
+store = get_store(STORE_PATH)
 
-if "checkout_complete" not in st.session_state:
-    st.session_state.checkout_complete = False
+# the session id lives in the URL, so a reload or a restarted server
+# brings the same cart back
+if "sid" not in st.query_params:
+    st.query_params["sid"] = uuid.uuid4().hex
+session_id = st.query_params["sid"]
 
-# Available engines
-engines = [
-    Engine(1, "Yamaha 150cc Engine", 55000, 150),
-    Engine(2, "KTM 200cc Engine", 85000, 200),
-    Engine(3, "Royal Enfield 350cc Engine", 120000, 350),
-    Engine(4, "Honda 500cc Engine", 200000, 500)
-]
+# the cart keeps (engine_id, quantity) lines and looks engines up in the
+# shared catalog, so a session holds no copies of engine data
+if "cart" not in st.session_state:
+    cart = ShoppingCart(catalog)
+    for engine_id, quantity in store.load_cart(session_id):
+        engine = catalog.get(engine_id)
+        if engine is not None:
+            cart.add_item(engine, quantity)
+    st.session_state.cart = cart
+    st.session_state.saved_cart = cart_lines(cart)
 
 # Main app
 st.title("🏍️ Online Bike Engine Store")
 st.markdown("**Welcome to the ultimate destination for premium bike engines!**")
 
+# the writer keeps failed cart saves queued and retries them
+if store.last_error is not None:
+    st.warning(f"Your cart could not be saved yet, it will be retried ({store.last_error})")
+
 # Tabs for different sections
 tab1, tab2, tab3 = st.tabs(["🛍️ Shop", "🛒 Cart", "📋 Checkout"])
 
 # TAB 1: SHOP
 with tab1:
     st.header("Available Bike Engines")
-    
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        query = st.text_input("Search engines", placeholder="e.g. royal 350")
+        price_range = range_slider("Price (₹)", catalog.bounds("price"), 500)
+    with col2:
+        sort = st.selectbox("Sort by", ["Price: low to high", "Price: high to low",
+                                        "Horsepower: low to high", "Horsepower: high to low"])
+        hp_range = range_slider("Horsepower", catalog.bounds("horsepower"), 1)
+
+    results = catalog.search(
+        query, price=price_range, horsepower=hp_range,
+        sort="price" if sort.startswith("Price") else "horsepower",
+        descending=sort.endswith("high to low"),
+    )
+
+    # back to the first page whenever the filters change
+    filters = (query, price_range, hp_range, sort)
+    if st.session_state.get("shop_filters") != filters:
+        st.session_state.shop_filters = filters
+        st.session_state.shop_page = 1
+    pages = max(1, math.ceil(len(results) / PAGE_SIZE))
+    with col3:
+        page = st.number_input("Page", min_value=1, max_value=pages, key="shop_page")
+    page_results, _ = page_of(results, page, PAGE_SIZE)
+    st.caption(f"{len(results):,} of {len(catalog):,} engines · page {page} of {pages}")
+
     col1, col2 = st.columns(2)
-    
-    for idx, engine in enumerate(engines):
+
+    # only the current page is rendered
+    for idx, engine in enumerate(page_results):
         with col1 if idx % 2 == 0 else col2:
             st.markdown(f"""
             <div class="engine-card">
-            <h4>{engine.name}</h4>
+            <h4>{html.escape(engine.name)}</h4>
             <p><strong>Horsepower:</strong> {engine.horsepower} HP</p>
             <p><strong>Price:</strong> ₹{engine.price:,.0f}</p>
             </div>
@@ -142,18 +178,18 @@ with tab1:
 with tab2:
     st.header("Your Shopping Cart")
     
-    if not st.session_state.cart.items:
+    if not st.session_state.cart:
         st.info("🛒 Your cart is empty. Start shopping!")
     else:
         st.markdown("---")
         
-        # Display cart items
-        for item in st.session_state.cart.items:
+        # Display cart items (a copy, since a remove changes the cart)
+        for engine, item in list(st.session_state.cart.lines()):
             col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
             
             with col1:
-                st.write(f"**{item.engine.name}**")
-                st.caption(f"₹{item.engine.price:,.0f} per unit")
+                st.write(f"**{engine.name}**")
+                st.caption(f"₹{engine.price:,.0f} per unit")
             
             with col2:
                 new_qty = st.number_input(
@@ -161,17 +197,18 @@ with tab2:
                     min_value=1,
                     max_value=10,
                     value=item.quantity,
-                    key=f"cart_qty_{item.engine.engine_id}",
+                    key=f"cart_qty_{engine.engine_id}",
                     label_visibility="collapsed"
                 )
-                item.quantity = new_qty
+                if new_qty != item.quantity:
+                    st.session_state.cart.set_quantity(engine.engine_id, new_qty)
             
             with col3:
-                st.write(f"₹{item.total_price():,.0f}")
+                st.write(f"₹{engine.price * new_qty:,.0f}")
             
             with col4:
-                if st.button("❌", key=f"remove_{item.engine.engine_id}"):
-                    st.session_state.cart.remove_item(item.engine.engine_id)
+                if st.button("❌", key=f"remove_{engine.engine_id}"):
+                    st.session_state.cart.remove_item(engine.engine_id)
                     st.rerun()
         
         st.markdown("---")
@@ -195,14 +232,14 @@ with tab2:
 with tab3:
     st.header("Checkout")
     
-    if not st.session_state.cart.items:
+    if not st.session_state.cart:
         st.warning("Your cart is empty. Add items before checking out!")
     else:
         st.subheader("Order Summary")
         
         # Display order details
-        for item in st.session_state.cart.items:
-            st.write(f"• {item.engine.name} × {item.quantity} = ₹{item.total_price():,.0f}")
+        for engine, item in st.session_state.cart.lines():
+            st.write(f"• {engine.name} × {item.quantity} = ₹{item.total_price(engine):,.0f}")
         
         st.markdown("---")
         st.markdown(f"### Total Amount: ₹{st.session_state.cart.get_total():,.0f}")
@@ -235,7 +272,20 @@ with tab3:
             if not all([name, email, phone, address, terms]):
                 st.error("Please fill all required fields and agree to terms!")
             else:
-                # Simulate successful checkout
+                # time-sortable and unique across sessions and processes
+                order_id = new_order_id()
+                cart = st.session_state.cart
+                # order, order lines and cart removal in one transaction
+                try:
+                    store.place_order(
+                        order_id, session_id,
+                        {"name": name, "email": email, "phone": phone, "address": address,
+                         "payment_method": payment_method},
+                        [(engine, item.quantity) for engine, item in cart.lines()],
+                    )
+                except sqlite3.Error as exc:
+                    st.error(f"Could not place the order, please try again ({exc})")
+                    st.stop()
                 st.success("🎉 Order Placed Successfully!")
                 st.balloons()
                 
@@ -244,7 +294,7 @@ with tab3:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.write(f"**Order ID:** #OSC{datetime.now().strftime('%Y%m%d%H%M%S')}")
+                    st.write(f"**Order ID:** #{order_id}")
                     st.write(f"**Customer:** {name}")
                     st.write(f"**Email:** {email}")
                 
@@ -252,20 +302,21 @@ with tab3:
                     st.write(f"**Phone:** {phone}")
                     st.write(f"**Address:** {address}")
                 
-                st.write(f"**Total Amount:** ₹{st.session_state.cart.get_total():,.0f}")
+                st.write(f"**Total Amount:** ₹{st.session_state.cart.exact_total():,.0f}")
                 st.write(f"**Payment Method:** {payment_method}")
                 
                 st.info("📧 A confirmation email has been sent to your email address.")
                 
-                # Reset cart
+                # Reset cart (the stored cart was removed with the order)
                 st.session_state.cart.clear_cart()
+                st.session_state.saved_cart = ()
                 st.session_state.checkout_complete = False
 
 # Sidebar
 with st.sidebar:
     st.header("📊 Cart Summary")
-    if st.session_state.cart.items:
-        st.metric("Items in Cart", len(st.session_state.cart.items))
+    if st.session_state.cart:
+        st.metric("Items in Cart", len(st.session_state.cart))
         st.metric("Total Value", f"₹{st.session_state.cart.get_total():,.0f}")
     else:
         st.info("Cart is empty")
@@ -279,3 +330,10 @@ with st.sidebar:
     st.write("**Contact Us:**")
     st.write("📧 Email: support@bikeengines.com")
     st.write("📞 Phone: +91-9876543210")
+
+# hand changed carts to the write-behind store; this returns at once and
+# the disk write happens on the store's writer thread
+lines = cart_lines(st.session_state.cart)
+if lines != st.session_state.saved_cart:
+    store.save_cart(session_id, lines)
+    st.session_state.saved_cart = lines
@@ -30,6 +30,74 @@
     </div>
 
 <script>
+    const API_URL = "http://127.0.0.1:8000";
+    // the model description is kept in localStorage with its ETag and reused
+    // for as long as the server's Cache-Control allows; no-cache (the
+    // default) revalidates on every submit, which a 304 answers without a body
+    const MODEL_KEY = "house-price-model";
+
+    function cachedModel() {
+        try {
+            return JSON.parse(localStorage.getItem(MODEL_KEY));
+        } catch (err) {
+            return null;
+        }
+    }
+
+    function freshUntil(response) {
+        const cacheControl = response.headers.get("Cache-Control") || "";
+        const maxAge = cacheControl.match(/max-age=(\d+)/);
+        if (/no-cache|no-store/.test(cacheControl) || !maxAge) {
+            return Date.now();
+        }
+        return Date.now() + parseInt(maxAge[1]) * 1000;
+    }
+
+    async function refreshModel(cached) {
+        const headers = cached && cached.etag ? { "If-None-Match": cached.etag } : {};
+        const response = await fetch(`${API_URL}/model/coefficients`, { headers });
+        let entry;
+        if (response.status === 304) {
+            entry = { ...cached, freshUntil: freshUntil(response) };
+        } else if (response.status === 404) {
+            // not a linear model: predict through the API until the 404's max-age runs out
+            entry = { remoteOnly: true, freshUntil: freshUntil(response) };
+        } else if (response.ok) {
+            entry = { etag: response.headers.get("ETag"), model: await response.json(), freshUntil: freshUntil(response) };
+        } else {
+            throw new Error(`model coefficients: HTTP ${response.status}`);
+        }
+        localStorage.setItem(MODEL_KEY, JSON.stringify(entry));
+        return entry;
+    }
+
+    async function currentModel() {
+        let entry = cachedModel();
+        if (!entry || Date.now() >= entry.freshUntil) {
+            try {
+                entry = await refreshModel(entry);
+            } catch (err) {
+                // API unreachable: the last known model is still good for scoring
+            }
+        }
+        return entry && entry.model ? entry.model : null;
+    }
+
+    function scoreLocally(model, data) {
+        const price = model.features.reduce((sum, name, i) => sum + model.coefficients[i] * data[name], model.intercept);
+        return Math.round(price * 100) / 100;
+    }
+
+    async function predictRemotely(data) {
+        const response = await fetch(`${API_URL}/predict`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify(data)
+        });
+        const result = await response.json();
+        return result.predicted_price;
+    }
+
     document.getElementById("predictForm").addEventListener("submit", async function(e){
         e.preventDefault();
 
@@ -39,15 +107,13 @@
             bathrooms: parseInt(document.getElementById("bathrooms").value)
         };
 
-        const response = await fetch("http://127.0.0.1:8000/predict", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify(data)
-        });
-
-        const result = await response.json();
-        document.getElementById("result").innerText = `Predicted Price: $${result.predicted_price}`;
+        const model = await currentModel();
+        const price = model ? scoreLocally(model, data) : await predictRemotely(data);
+        document.getElementById("result").innerText = `Predicted Price: $${price}`;
     });
+
+    // fetch or revalidate the model before the first submit
+    currentModel();
 </script>
 
 </body>
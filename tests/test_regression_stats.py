@@ -0,0 +1,75 @@
+"""Parity of the chunked RegressionStats fit with LinearRegression.fit."""
+
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "backend"))
+
+from sklearn.linear_model import LinearRegression  # noqa: E402
+
+from regression_stats import RegressionStats  # noqa: E402
+
+FEATURES = ["area", "bedrooms", "bathrooms"]
+
+
+def houses(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.uniform(500, 5000, n_rows),
+        rng.integers(1, 6, n_rows),
+        rng.integers(1, 4, n_rows),
+    ]).astype(float)
+    y = X @ np.array([120.0, 15000.0, 9000.0]) + rng.normal(0, 20000, n_rows)
+    return X, y
+
+
+def fit_chunked(X, y, sizes):
+    stats = RegressionStats(X.shape[1])
+    start = 0
+    for size in sizes:
+        stats.update(X[start:start + size], y[start:start + size])
+        start += size
+    assert start == len(y)
+    return stats.to_model(FEATURES)
+
+
+def assert_same_fit(chunked, expected, X):
+    np.testing.assert_allclose(chunked.coef_, expected.coef_, rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(chunked.intercept_, expected.intercept_, rtol=1e-6, atol=1e-6)
+    # to_model records feature names, so predict takes a DataFrame
+    frame = pd.DataFrame(X, columns=FEATURES)
+    np.testing.assert_allclose(chunked.predict(frame), expected.predict(X), rtol=1e-9, atol=1e-4)
+
+
+@pytest.mark.parametrize("sizes", [
+    [997] * 10 + [30],
+    [1, 2, 3000, 6997],
+    [1, 9999],
+])
+def test_uneven_chunks_match_in_memory_fit(sizes):
+    X, y = houses(10000)
+    assert_same_fit(fit_chunked(X, y, sizes), LinearRegression().fit(X, y), X)
+
+
+def test_example_data_in_chunks_of_two():
+    X = np.array([[1000, 2, 1], [1500, 3, 2], [1200, 2, 2], [1800, 4, 3], [2000, 4, 3]], dtype=float)
+    y = np.array([120000, 180000, 150000, 240000, 270000], dtype=float)
+    assert_same_fit(fit_chunked(X, y, [2, 2, 1]), LinearRegression().fit(X, y), X)
+
+
+def test_collinear_columns_give_the_minimum_norm_solution():
+    X, y = houses(2000, seed=1)
+    # bathrooms copied from bedrooms, so X^T X is singular
+    X[:, 2] = X[:, 1]
+    assert_same_fit(fit_chunked(X, y, [1, 499, 1500]), LinearRegression().fit(X, y), X)
+
+
+def test_empty_stats_cannot_be_solved():
+    with pytest.raises(ValueError):
+        RegressionStats(3).solve()
@@ -0,0 +1,62 @@
+"""Parity of backend/scoring.py scorers with model.predict."""
+
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "backend"))
+
+from sklearn.ensemble import GradientBoostingRegressor  # noqa: E402
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge  # noqa: E402
+
+from scoring import LINEAR_MODELS, LinearScorer, SklearnScorer, check_parity, make_scorer  # noqa: E402
+
+LINEAR_ESTIMATORS = {
+    LinearRegression: {},
+    Ridge: {"alpha": 1.0},
+    Lasso: {"alpha": 0.1},
+    ElasticNet: {"alpha": 0.1, "l1_ratio": 0.5},
+}
+
+
+@pytest.fixture
+def houses():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([
+        rng.uniform(300, 6000, 200),
+        rng.integers(1, 8, 200),
+        rng.integers(1, 6, 200),
+    ]).astype(np.float64)
+    y = X @ np.array([150.0, 20000.0, 15000.0]) + 50000.0 + rng.normal(0, 5000, 200)
+    return X, y
+
+
+def test_every_linear_model_is_covered():
+    assert set(LINEAR_ESTIMATORS) == set(LINEAR_MODELS)
+
+
+@pytest.mark.parametrize("estimator", list(LINEAR_ESTIMATORS), ids=lambda cls: cls.__name__)
+def test_linear_scorer_matches_predict(estimator, houses):
+    X, y = houses
+    model = estimator(**LINEAR_ESTIMATORS[estimator]).fit(X, y)
+    scorer = check_parity(model, X)
+    assert isinstance(scorer, LinearScorer)
+
+
+def test_two_dimensional_coef_falls_back_to_sklearn(houses):
+    X, y = houses
+    model = LinearRegression().fit(X, np.column_stack([y, y / 2]))
+    scorer = make_scorer(model)
+    assert isinstance(scorer, SklearnScorer)
+    np.testing.assert_allclose(scorer.predict(X), model.predict(X))
+
+
+def test_non_linear_model_uses_sklearn_scorer(houses):
+    X, y = houses
+    model = GradientBoostingRegressor(n_estimators=20, random_state=0).fit(X, y)
+    scorer = check_parity(model, X[:50])
+    assert isinstance(scorer, SklearnScorer)
@@ -0,0 +1,83 @@
+"""Shared theming for the Streamlit apps.
+
+The CSS for a theme is built once per distinct set of colours and reused on
+every later rerun. Streamlit removes any element a rerun does not emit, so
+the style block is still sent each run, but as one prebuilt string instead of
+several f-strings rebuilt from scratch.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import streamlit as st
+
+HEADER_FONT_CSS = """
+h1, h2, h3, h4, h5, h6, .css-1d391kg, .css-qbe2hs {
+    font-family: 'Times New Roman', serif !important;
+}
+"""
+
+
+class Theme(NamedTuple):
+    bg_color: str = "#420505"
+    text_color: str = "#000000"
+    button_color: str = "#4CAF50"
+    button_text_color: str = "#FFFFFF"
+    input_bg_color: str = "#FFFFFF"
+    input_text_color: str = "#000000"
+    success_bg_color: str = "#D4EDDA"
+    success_text_color: str = "#155724"
+    error_bg_color: str = "#F8D7DA"
+    error_text_color: str = "#721C24"
+
+
+@lru_cache(maxsize=64)
+def build_css(theme, extra_css=HEADER_FONT_CSS):
+    return f"""<style>
+{extra_css}
+.stApp {{
+    background-color: {theme.bg_color};
+    color: {theme.text_color};
+}}
+.stButton>button {{
+    background-color: {theme.button_color};
+    color: {theme.button_text_color};
+}}
+.stNumberInput input, .stTextInput input {{
+    background-color: {theme.input_bg_color};
+    color: {theme.input_text_color};
+}}
+[data-testid="stAlertContentSuccess"] {{
+    background-color: {theme.success_bg_color};
+    color: {theme.success_text_color};
+}}
+[data-testid="stAlertContentError"] {{
+    background-color: {theme.error_bg_color};
+    color: {theme.error_text_color};
+}}
+</style>"""
+
+
+def apply_theme(theme, extra_css=HEADER_FONT_CSS):
+    st.markdown(build_css(theme, extra_css), unsafe_allow_html=True)
+
+
+def theme_from_sidebar(default=Theme()):
+    """The ten sidebar colour pickers of the wine app, as a Theme."""
+    st.sidebar.header("Customize Colors")
+    return Theme(
+        # Background and text
+        bg_color=st.sidebar.color_picker("Background Color", default.bg_color),
+        text_color=st.sidebar.color_picker("Text Color", default.text_color),
+        # Button
+        button_color=st.sidebar.color_picker("Button Color", default.button_color),
+        button_text_color=st.sidebar.color_picker("Button Text Color", default.button_text_color),
+        # Input boxes
+        input_bg_color=st.sidebar.color_picker("Input Box Background", default.input_bg_color),
+        input_text_color=st.sidebar.color_picker("Input Text Color", default.input_text_color),
+        # Result boxes
+        success_bg_color=st.sidebar.color_picker("Success Box Background", default.success_bg_color),
+        success_text_color=st.sidebar.color_picker("Success Text Color", default.success_text_color),
+        error_bg_color=st.sidebar.color_picker("Error Box Background", default.error_bg_color),
+        error_text_color=st.sidebar.color_picker("Error Text Color", default.error_text_color),
+    )
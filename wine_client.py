@@ -0,0 +1,85 @@
+"""Shared HTTP client for the wine quality Streamlit app.
+
+One pooled keep-alive session per server process, explicit connect/read
+timeouts, bounded retries with jittered backoff, and memoized predictions so
+reruns and repeated clicks with the same inputs never leave the process.
+"""
+
+import os
+import random
+import time
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+API_URL = os.environ.get("WINE_API_URL", "http://127.0.0.1:8000/predict")
+
+# (connect, read) in seconds, so a stalled backend cannot hang a script run
+TIMEOUT = (float(os.environ.get("WINE_API_CONNECT_TIMEOUT", "3.05")),
+           float(os.environ.get("WINE_API_READ_TIMEOUT", "10")))
+MAX_RETRIES = int(os.environ.get("WINE_API_MAX_RETRIES", "3"))
+BACKOFF_SECONDS = 0.2
+# longest wait before a retry; a server asking for more (Retry-After) is
+# not retried, so a script run never sleeps for minutes
+MAX_BACKOFF_SECONDS = float(os.environ.get("WINE_API_MAX_BACKOFF", "5"))
+RETRY_STATUSES = {429, 502, 503, 504}
+# predictions are reused for this long, per (alcohol, density, pH)
+CACHE_TTL_SECONDS = int(os.environ.get("WINE_API_CACHE_TTL", "3600"))
+
+
+class PredictionError(Exception):
+    """The API answered, but not with a prediction."""
+
+
+@st.cache_resource
+def get_session():
+    # shared by every session and rerun of this server process
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def backoff_delay(attempt, response=None):
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    # full jitter: spreads retries from many clients over the window
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** attempt))
+
+
+def post_with_retries(url, payload):
+    session = get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        last_try = attempt == MAX_RETRIES
+        try:
+            response = session.post(url, json=payload, timeout=TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            if last_try:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        if response.status_code in RETRY_STATUSES and not last_try:
+            delay = backoff_delay(attempt, response)
+            if delay > MAX_BACKOFF_SECONDS:
+                # fail fast instead of blocking the script run
+                return response
+            time.sleep(delay)
+            continue
+        return response
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=4096, show_spinner=False)
+def predict_quality(alcohol, density, pH):
+    # failures raise, and Streamlit does not cache exceptions, so only
+    # successful predictions are memoized
+    response = post_with_retries(API_URL, {"alcohol": alcohol, "density": density, "pH": pH})
+    if response.status_code != 200:
+        raise PredictionError(f"API returned status {response.status_code}")
+    try:
+        return response.json()["predicted_quality"]
+    except (ValueError, KeyError, TypeError) as exc:
+        # not JSON, not an object, or no predicted_quality field
+        raise PredictionError("API returned no predicted_quality") from exc